@@ -1,6 +1,8 @@
 """
 app.py - Fashion E-commerce Sentiment Analysis Dashboard (FULLY FIXED VERSION)
 """
+import html
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -14,13 +16,27 @@ except LookupError:
 # Import custom modules
 from src.data_loader import DataLoader
 from src.preprocessing import TextPreprocessor
-from src.model import SentimentModel
+from src.model import SentimentModel, hash_training_data
 from src.visualization import Visualizer
+from src.cache import PreprocessedCache, ImageCache
+from src.analytics import AnalyticsSnapshot
+from src.browser import ReviewBrowser
+from src import instrumentation
 from config.config import (
     PAGE_CONFIG, SENTIMENT_CONFIG, CHAT_RESPONSES,
-    EXAMPLE_TEXTS, REVIEWS_CSV, CHART_COLORS
+    EXAMPLE_TEXTS, REVIEWS_CSV, CHART_COLORS, PREPROCESSED_CACHE,
+    LEMMA_CACHE, PREPROCESSING_CONFIG, MODEL_ARTIFACT, MODEL_CONFIG,
+    INSTRUMENTATION_CONFIG, WORDCLOUD_CACHE_DIR, BROWSER_CONFIG
 )
 
+# Word clouds on the Word Trends tab: sentiment -> (colormap, width, height)
+WORDCLOUD_VARIANTS = {
+    'all': ('RdPu', 1200, 600),
+    'positive': ('Greens', 800, 400),
+    'negative': ('Reds', 800, 400),
+    'neutral': ('Purples', 800, 400)
+}
+
 # Page configuration with fashion theme
 st.set_page_config(
     page_title="Fashion Review Analyzer",
@@ -29,6 +45,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+instrumentation.configure(
+    enabled=INSTRUMENTATION_CONFIG['enabled'],
+    trace_memory=INSTRUMENTATION_CONFIG['trace_memory'],
+    max_samples=INSTRUMENTATION_CONFIG['max_samples']
+)
+rerun_timer = instrumentation.section('app.rerun').start()
+
 st.markdown("""
     <style>
     /* Import Google Fonts */
@@ -590,26 +613,70 @@ st.markdown("""
 
 @st.cache_resource
 def load_and_prepare_data():
-    """Load and preprocess data (cached)"""
+    """Load and preprocess data (cached), returning the data, preprocessor and dataset version"""
     loader = DataLoader(str(REVIEWS_CSV))
-    preprocessor = TextPreprocessor()
+    preprocessor = TextPreprocessor(
+        lemma_cache_size=PREPROCESSING_CONFIG['lemma_cache_size'],
+        lemma_cache_path=str(LEMMA_CACHE)
+    )
+    cache = PreprocessedCache(str(PREPROCESSED_CACHE))
 
-    try:
-        df = loader.load_from_csv()
-    except FileNotFoundError:
+    if not REVIEWS_CSV.exists():
         st.warning("👗 Data file not found. Creating sample fashion reviews...")
-        df = loader.create_sample_csv(str(REVIEWS_CSV))
+        loader.create_sample_csv(str(REVIEWS_CSV))
+
+    # Reuse preprocessed reviews unless the data or preprocessing changed
+    cache_key = cache.make_key(str(REVIEWS_CSV), preprocessor.get_settings())
+    df = cache.load(cache_key)
+
+    if df is None:
+        df = loader.load_from_csv()
+        df = preprocessor.preprocess_dataframe(
+            df,
+            n_jobs=PREPROCESSING_CONFIG['n_jobs'],
+            chunksize=PREPROCESSING_CONFIG['chunksize']
+        )
+        cache.save(df, cache_key)
+        preprocessor.save_lemma_cache()
 
-    df = preprocessor.preprocess_dataframe(df)
-    return df, preprocessor
+    return df, preprocessor, cache_key
 
 
 @st.cache_resource
 def train_sentiment_model(_df):
-    """Train model (cached)"""
-    model = SentimentModel()
-    metrics = model.train(_df['cleaned_text'], _df['sentiment'])
-    return model, metrics
+    """Load the saved model for this data, or train and save one (cached)"""
+    data_hash = hash_training_data(_df['cleaned_text'], _df['sentiment'])
+    runtime_settings = {
+        'prediction_cache_size': MODEL_CONFIG['prediction_cache_size'],
+        'prediction_cache_ttl': MODEL_CONFIG['prediction_cache_ttl'],
+        'lean': MODEL_CONFIG['lean']
+    }
+
+    try:
+        model = SentimentModel.load(str(MODEL_ARTIFACT), data_hash=data_hash, **runtime_settings)
+    except (FileNotFoundError, ValueError):
+        model = SentimentModel(**runtime_settings)
+        model.train(_df['cleaned_text'], _df['sentiment'])
+        model.save(str(MODEL_ARTIFACT))
+
+    return model, model.metrics
+
+
+@st.cache_resource
+def build_analytics(data_version, _df):
+    """Corpus statistics for the tabs, computed once per dataset version (cached)"""
+    return AnalyticsSnapshot.from_dataframe(_df, version=data_version)
+
+
+@st.cache_resource
+def build_review_browser(data_version, _df):
+    """Index of reviews by sentiment, length and random order, built once per dataset version (cached)"""
+    return ReviewBrowser(
+        _df,
+        random_state=BROWSER_CONFIG['random_state'],
+        scan_block=BROWSER_CONFIG['scan_block'],
+        cursor_cache_size=BROWSER_CONFIG['cursor_cache_size']
+    )
 
 
 @st.cache_resource
@@ -624,10 +691,87 @@ def initialize_visualizer():
     return Visualizer(color_map=improved_colors)
 
 
+@st.cache_resource
+def get_wordcloud_cache(render_version):
+    """Rendered word clouds, shared by all sessions (cached)"""
+    return ImageCache(str(WORDCLOUD_CACHE_DIR), version=render_version)
+
+
+def render_wordcloud(sentiment, wordcloud_cache, analytics, viz):
+    """PNG word cloud of a sentiment ('all' for every review), rendered at most once per dataset version"""
+    colormap, width, height = WORDCLOUD_VARIANTS[sentiment]
+    key = (analytics.version, sentiment, colormap, width, height)
+
+    return wordcloud_cache.get_or_render(key, lambda: viz.create_wordcloud_png(
+        viz.wordcloud_frequencies(analytics.token_counts.get(sentiment, {})),
+        colormap=colormap, width=width, height=height
+    ))
+
+
+@st.cache_resource
+def start_wordcloud_warmup(data_version, _wordcloud_cache, _analytics, _viz):
+    """Render every word-cloud variant in the background once per dataset version"""
+    thread = threading.Thread(
+        target=lambda: [
+            render_wordcloud(sentiment, _wordcloud_cache, _analytics, _viz)
+            for sentiment in WORDCLOUD_VARIANTS
+        ],
+        name='wordcloud-warmup',
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+# Per-tab providers: every chart is built on first use and then reused until
+# the data or model changes, so a rerun only pays for the widgets that changed
+@st.cache_resource
+def get_sentiment_pie_chart(data_version, _viz, _analytics):
+    """Sentiment distribution pie chart for the Overview tab (cached)"""
+    return _viz.create_sentiment_pie_chart(_analytics.class_counts)
+
+
+@st.cache_resource
+def get_word_length_boxplot(data_version, _viz, _analytics):
+    """Review length boxplot per sentiment for the Exploration tab (cached)"""
+    return _viz.create_word_length_boxplot(_analytics.word_counts)
+
+
+@st.cache_resource
+def get_train_score(model_version, _model, _df):
+    """Accuracy on the full dataset, used to detect overfitting (cached)"""
+    return _model.model.score(_model.vectorizer.transform(_df['cleaned_text']), _df['sentiment'])
+
+
+@st.cache_resource
+def get_confusion_matrix_png(model_version, _viz, _metrics):
+    """Confusion matrix rendered to PNG for the Performance tab (cached)"""
+    labels = ['Negative', 'Neutral', 'Positive']
+    return _viz.figure_to_png(_viz.create_confusion_matrix(_metrics['confusion_matrix'], labels))
+
+
+@st.cache_resource
+def get_performance_bar_chart(model_version, _viz, _metrics):
+    """Per-class precision, recall and F1 bar chart (cached)"""
+    return _viz.create_performance_bar_chart(_metrics['classification_report'])
+
+
+@st.cache_resource
+def get_top_words_chart(data_version, _viz, _analytics, n=20):
+    """Most frequent words bar chart for the Word Trends tab (cached)"""
+    return _viz.create_top_words_bar_chart(_analytics.top_words('all', n))
+
+
 # Initialize components
-df, preprocessor = load_and_prepare_data()
-model, metrics = train_sentiment_model(df)
+with instrumentation.section('app.load_and_prepare_data'):
+    df, preprocessor, data_version = load_and_prepare_data()
+with instrumentation.section('app.train_sentiment_model'):
+    model, metrics = train_sentiment_model(df)
+analytics = build_analytics(data_version, df)
+browser = build_review_browser(data_version, df)
 viz = initialize_visualizer()
+wordcloud_cache = get_wordcloud_cache(viz.wordcloud_render_version())
+start_wordcloud_warmup(data_version, wordcloud_cache, analytics, viz)
 
 # IMPROVED Header with Fashion Theme
 st.markdown("""
@@ -664,7 +808,7 @@ with st.sidebar:
 
     st.markdown("---")
     st.subheader("📊 Store Insights")
-    st.metric("Total Reviews", f"{len(df):,}")
+    st.metric("Total Reviews", f"{analytics.n_reviews:,}")
     st.metric("AI Accuracy", f"{metrics['accuracy']:.1%}")
 
     st.markdown("---")
@@ -693,20 +837,20 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 ])
 
 # TAB 1: Overview
-with tab1:
+with tab1, instrumentation.section('tab.overview'):
     st.markdown(
         '<div class="section-header"><span style="font-size: 2rem;">🪄</span><h2>Fashion Store Overview</h2></div>',
         unsafe_allow_html=True)
 
     # Enhanced Metrics with Fashion Icons
     col1, col2, col3, col4 = st.columns(4)
-    sentiment_counts = df['sentiment'].value_counts()
+    sentiment_counts = analytics.class_counts
 
     with col1:
         st.markdown(f"""
         <div class="metric-card">
             <span class="fashion-icon">🛍️</span>
-            <h2 style="margin:0; font-size:3rem;" class="metric-number">{len(df)}</h2>
+            <h2 style="margin:0; font-size:3rem;" class="metric-number">{analytics.n_reviews}</h2>
             <p style="margin:0; font-size:1.1rem; font-weight: 600;">Total Reviews</p>
         </div>
         """, unsafe_allow_html=True)
@@ -747,7 +891,7 @@ with tab1:
         st.markdown(
             '<div class="section-header"><span style="font-size: 1.5rem;">📊</span><h3>Customer Sentiment Distribution</h3></div>',
             unsafe_allow_html=True)
-        fig_pie = viz.create_sentiment_pie_chart(sentiment_counts)
+        fig_pie = get_sentiment_pie_chart(data_version, viz, analytics)
         st.plotly_chart(fig_pie, use_container_width=False)
 
     with col2:
@@ -757,11 +901,13 @@ with tab1:
         sentiment_filter = st.selectbox("Filter by sentiment:", ["All", "Positive", "Negative", "Neutral"],
                                         key="overview_filter")
 
-        if sentiment_filter == "All":
-            sample_df = df.sample(min(5, len(df)))
-        else:
-            filtered = df[df['sentiment'] == sentiment_filter.lower()]
-            sample_df = filtered.sample(min(5, len(filtered))) if len(filtered) > 0 else filtered
+        # Each click shows the next reviews of a fixed shuffle
+        if 'overview_draw' not in st.session_state:
+            st.session_state.overview_draw = 0
+        if st.button("🔀 Show other reviews", key="overview_shuffle"):
+            st.session_state.overview_draw += 1
+
+        sample_df = browser.sample(5, sentiment_filter.lower(), st.session_state.overview_draw)
 
         for _, row in sample_df.iterrows():
             sentiment_emoji = {"positive": "😊", "negative": "😞", "neutral": "😐"}
@@ -775,7 +921,7 @@ with tab1:
                 """, unsafe_allow_html=True)
 
 # TAB 2: Data Exploration
-with tab2:
+with tab2, instrumentation.section('tab.exploration'):
     st.markdown(
         '<div class="section-header"><span style="font-size: 2rem;">🔍</span><h2>Fashion Review Exploration</h2></div>',
         unsafe_allow_html=True)
@@ -786,34 +932,37 @@ with tab2:
         st.markdown(
             '<div class="section-header"><span style="font-size: 1.5rem;">📏</span><h3>Review Length Analysis</h3></div>',
             unsafe_allow_html=True)
-        fig_box = viz.create_word_length_boxplot(df)
+        fig_box = get_word_length_boxplot(data_version, viz, analytics)
         st.plotly_chart(fig_box, use_container_width=False)
 
     with col2:
         st.markdown(
             '<div class="section-header"><span style="font-size: 1.5rem;">📊</span><h3>Review Statistics</h3></div>',
             unsafe_allow_html=True)
-        avg_words = df['word_count'].mean()
-        avg_chars = df['char_count'].mean()
+        lengths = analytics.lengths()
 
-        st.metric("👗 Avg Words/Review", f"{avg_words:.0f}")
-        st.metric("✏️ Avg Chars/Review", f"{avg_chars:.0f}")
-        st.metric("📖 Longest Review", f"{df['word_count'].max()} words")
-        st.metric("📄 Shortest Review", f"{df['word_count'].min()} words")
+        st.metric("👗 Avg Words/Review", f"{lengths['avg_words']:.0f}")
+        st.metric("✏️ Avg Chars/Review", f"{lengths['avg_chars']:.0f}")
+        st.metric("📖 Longest Review", f"{lengths['max_words']} words")
+        st.metric("📄 Shortest Review", f"{lengths['min_words']} words")
 
     st.markdown("---")
     st.markdown(
         '<div class="section-header"><span style="font-size: 1.5rem;">🔬</span><h3>Text Processing Preview</h3></div>',
         unsafe_allow_html=True)
 
-    sample_indices = df.sample(3).index
+    if 'preview_draw' not in st.session_state:
+        st.session_state.preview_draw = 0
+    if st.button("🔀 Show other reviews", key="preview_shuffle"):
+        st.session_state.preview_draw += 1
+
     comparison_data = []
 
-    for idx in sample_indices:
+    for _, row in browser.sample(3, 'all', st.session_state.preview_draw).iterrows():
         comparison_data.append({
-            "👗 Original Review": df.loc[idx, 'text'][:100] + "...",
-            "✨ Cleaned Text": df.loc[idx, 'cleaned_text'][:100] + "...",
-            "💭 Sentiment": df.loc[idx, 'sentiment'].title()
+            "👗 Original Review": row['text'][:100] + "...",
+            "✨ Cleaned Text": row['cleaned_text'][:100] + "...",
+            "💭 Sentiment": row['sentiment'].title()
         })
 
     # Custom styled dataframe for text processing
@@ -847,7 +996,7 @@ with tab2:
 
     for col, sentiment in zip([col1, col2, col3], ['positive', 'negative', 'neutral']):
         with col:
-            avg_length = df[df['sentiment'] == sentiment]['word_count'].mean()
+            avg_length = analytics.lengths(sentiment).get('avg_words', float('nan'))
             st.markdown(f"""
             <div class="stat-box" style="background: {colors[sentiment]}15; border-left: 5px solid {colors[sentiment]}; border-color: {colors[sentiment]};">
                 <div style="font-size: 2.5rem; margin-bottom: 0.8rem;">{icons[sentiment]}</div>
@@ -857,8 +1006,82 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
 
+    # Review browser
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(
+        '<div class="section-header"><span style="font-size: 1.5rem;">🗂️</span><h3>Browse Reviews</h3></div>',
+        unsafe_allow_html=True)
+
+    # A slider needs max > min, even if every review has the same length
+    all_lengths = analytics.lengths()
+    shortest = all_lengths['min_words']
+    longest = max(all_lengths['max_words'], shortest + 1)
+
+    col1, col2, col3 = st.columns([1, 2, 2])
+    with col1:
+        browse_sentiment = st.selectbox("Sentiment:", ["All", "Positive", "Negative", "Neutral"],
+                                        key="browse_sentiment")
+    with col2:
+        browse_keyword = st.text_input("Contains:", key="browse_keyword",
+                                       placeholder="e.g. fabric, runs small")
+    with col3:
+        browse_range = st.slider(
+            "Review length (words):",
+            min_value=shortest,
+            max_value=longest,
+            value=(shortest, longest),
+            key="browse_range"
+        )
+
+    # Back to the first page whenever a filter changes
+    browse_filters = (browse_sentiment, browse_keyword, browse_range)
+    if st.session_state.get('browse_filters') != browse_filters:
+        st.session_state.browse_filters = browse_filters
+        st.session_state.browse_page = 0
+
+    full_range = browse_range == (shortest, longest)
+    result = browser.page(
+        page=st.session_state.browse_page,
+        page_size=BROWSER_CONFIG['page_size'],
+        sentiment=browse_sentiment.lower(),
+        keyword=browse_keyword,
+        min_words=None if full_range else browse_range[0],
+        max_words=None if full_range else browse_range[1]
+    )
+
+    if result['rows'].empty:
+        st.info("No reviews match these filters.")
+    else:
+        table_html = "<table class='custom-table'><thead><tr>"
+        table_html += "<th>👗 Review</th><th>📏 Words</th><th>💭 Sentiment</th>"
+        table_html += "</tr></thead><tbody>"
+        for _, row in result['rows'].iterrows():
+            text = html.escape(row['text'][:300] + ("..." if len(row['text']) > 300 else ""))
+            table_html += f"<tr><td>{text}</td><td>{row['word_count']}</td>"
+            table_html += f"<td><span class='sentiment-badge sentiment-{row['sentiment']}'>{row['sentiment'].title()}</span></td></tr>"
+        table_html += "</tbody></table>"
+        st.markdown(table_html, unsafe_allow_html=True)
+
+    first = result['page'] * result['page_size'] + 1
+    shown = f"{first:,}–{first + len(result['rows']) - 1:,}"
+    total = f"{result['total']:,}" if result['total'] is not None else "many"
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", key="browse_prev", disabled=result['page'] == 0, use_container_width=True):
+            st.session_state.browse_page -= 1
+            st.rerun()
+    with col2:
+        if not result['rows'].empty:
+            st.markdown(f"<p style='text-align: center;'>Reviews {shown} of {total}</p>",
+                        unsafe_allow_html=True)
+    with col3:
+        if st.button("Next ➡️", key="browse_next", disabled=not result['has_next'], use_container_width=True):
+            st.session_state.browse_page += 1
+            st.rerun()
+
 # TAB 3: Model Performance
-with tab3:
+with tab3, instrumentation.section('tab.performance'):
     st.markdown(
         '<div class="section-header"><span style="font-size: 2rem;">📈</span><h2>AI Model Performance</h2></div>',
         unsafe_allow_html=True)
@@ -866,10 +1089,7 @@ with tab3:
     summary = model.get_metrics_summary()
 
     # Calculate training accuracy to detect overfitting
-    train_score = model.model.score(
-        model.vectorizer.transform(df['cleaned_text']),
-        df['sentiment']
-    )
+    train_score = get_train_score(model.model_version, model, df)
     test_score = summary['accuracy']
 
     # Determine model status
@@ -939,10 +1159,7 @@ with tab3:
         st.markdown(
             '<div class="section-header"><span style="font-size: 1.5rem;">🎯</span><h3>Confusion Matrix</h3></div>',
             unsafe_allow_html=True)
-        cm = metrics['confusion_matrix']
-        labels = ['Negative', 'Neutral', 'Positive']
-        fig_cm = viz.create_confusion_matrix(cm, labels)
-        st.pyplot(fig_cm)
+        st.image(get_confusion_matrix_png(model.model_version, viz, metrics))
 
     with col2:
         st.markdown(
@@ -998,11 +1215,11 @@ with tab3:
     st.markdown(
         '<div class="section-header"><span style="font-size: 1.5rem;">📊</span><h3>Performance Comparison</h3></div>',
         unsafe_allow_html=True)
-    fig_perf = viz.create_performance_bar_chart(report)
+    fig_perf = get_performance_bar_chart(model.model_version, viz, metrics)
     st.plotly_chart(fig_perf, use_container_width=False)
 
 # TAB 4: Word Analysis
-with tab4:
+with tab4, instrumentation.section('tab.word_trends'):
     st.markdown('<div class="section-header"><span style="font-size: 2rem;">💬</span><h2>Fashion Word Trends</h2></div>',
                 unsafe_allow_html=True)
 
@@ -1012,9 +1229,7 @@ with tab4:
         st.markdown(
             '<div class="section-header"><span style="font-size: 1.5rem;">☁️</span><h3>Fashion Keywords Cloud</h3></div>',
             unsafe_allow_html=True)
-        all_text = " ".join(df['cleaned_text'])
-        fig_wc = viz.create_wordcloud(all_text)
-        st.pyplot(fig_wc)
+        st.image(render_wordcloud('all', wordcloud_cache, analytics, viz))
 
     with col2:
         st.markdown(
@@ -1026,21 +1241,7 @@ with tab4:
         )
 
         if selected_sentiment != "All":
-            filtered_text = " ".join(df[df['sentiment'] == selected_sentiment.lower()]['cleaned_text'])
-
-            sentiment_colormaps = {
-                'Positive': 'Greens',
-                'Negative': 'Reds',
-                'Neutral': 'Purples'
-            }
-
-            fig_wc_filtered = viz.create_wordcloud(
-                filtered_text,
-                colormap=sentiment_colormaps[selected_sentiment],
-                width=800,
-                height=400
-            )
-            st.pyplot(fig_wc_filtered)
+            st.image(render_wordcloud(selected_sentiment.lower(), wordcloud_cache, analytics, viz))
 
         st.markdown("---")
         st.markdown("""
@@ -1057,11 +1258,9 @@ with tab4:
     col1, col2 = st.columns([2, 1], gap="large")
 
     with col1:
-        all_tokens = nltk.word_tokenize(all_text)
-        freq_dist = nltk.FreqDist(all_tokens)
-        top_20 = dict(freq_dist.most_common(20))
+        top_20 = analytics.top_words('all', 20)
 
-        fig_bar = viz.create_top_words_bar_chart(top_20)
+        fig_bar = get_top_words_chart(data_version, viz, analytics)
         st.plotly_chart(fig_bar, use_container_width=False)
 
     with col2:
@@ -1088,7 +1287,7 @@ with tab4:
         st.markdown(freq_html, unsafe_allow_html=True)
 
 # TAB 5: Chatbot
-with tab5:
+with tab5, instrumentation.section('tab.live_analyzer'):
     st.markdown(
         '<div class="section-header"><span style="font-size: 2rem;">🤖</span><h2>Live Fashion Review Analyzer</h2></div>',
         unsafe_allow_html=True)
@@ -1153,12 +1352,13 @@ with tab5:
         cleaned = preprocessor.clean_text(user_input)
 
         if cleaned.strip():
-            result = model.predict(cleaned)
+            result = model.predict_fast(cleaned)
             sentiment = result['prediction']
 
             # Add to history
             st.session_state.chat_history.insert(0, {
                 'input': user_input,
+                'cleaned': cleaned,
                 'sentiment': sentiment,
                 'probabilities': result['probabilities'],
                 'confidence': result['confidence']
@@ -1255,6 +1455,16 @@ with tab5:
                                                                                              'confidence'] > 0.5 else "⚠️ Low"
             st.metric("🎯 Overall Confidence", f"{latest['confidence']:.1%}", confidence_label)
 
+        # Explanations are only computed when asked for, so predictions stay fast
+        if st.checkbox("🔍 Why this prediction?", key="show_explanation"):
+            explanation = model.explain(latest['cleaned'], top_k=10)
+            contributions = explanation['contributions'][latest['sentiment']]
+            if contributions:
+                fig_contrib = viz.create_contribution_chart(contributions, latest['sentiment'])
+                st.plotly_chart(fig_contrib, use_container_width=True)
+            else:
+                st.info("None of the words in this review are in the model vocabulary.")
+
         # Chat history
         if len(st.session_state.chat_history) > 1:
             st.markdown("---")
@@ -1340,3 +1550,38 @@ st.markdown(f"""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+rerun_timer.stop()
+
+# Hidden debug panel, only rendered while instrumentation is switched on
+if instrumentation.registry.enabled:
+    if INSTRUMENTATION_CONFIG['dump_path']:
+        instrumentation.registry.dump(INSTRUMENTATION_CONFIG['dump_path'])
+
+    with st.sidebar:
+        with st.expander("🛠️ Instrumentation", expanded=False):
+            summary = instrumentation.registry.summary()
+
+            if summary['timers']:
+                timers = pd.DataFrame(summary['timers']).T.sort_values('total', ascending=False)
+                timers[['total', 'mean', 'p50', 'p95', 'max']] *= 1000
+                st.caption("Timers (ms)")
+                st.dataframe(timers.round(2), use_container_width=True)
+
+            if summary['memory']:
+                st.caption("Net allocation per call (MB)")
+                st.dataframe(pd.DataFrame(summary['memory']).T.round(3), use_container_width=True)
+                st.caption(f"tracemalloc peak: {summary.get('traced_peak_mb', 0):.1f} MB")
+
+            if summary['counters']:
+                st.caption("Counters")
+                st.json(summary['counters'])
+
+            st.download_button(
+                "⬇️ Download JSON",
+                data=instrumentation.registry.to_json(),
+                file_name="instrumentation.json",
+                mime="application/json"
+            )
+            if st.button("🔄 Reset Instrumentation"):
+                instrumentation.registry.reset()
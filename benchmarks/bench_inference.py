@@ -0,0 +1,130 @@
+"""
+bench_inference.py - Per-review latency of SentimentModel.predict vs the compiled predictor
+
+The baseline is predict() without its prediction cache, so every call runs
+the sklearn transform and model.
+
+Usage:
+    python benchmarks/bench_inference.py [--data data/reviews.csv] [--n 5000]
+        [--threshold 0.05] [--min-agreement 0.99]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data_loader import DataLoader
+from src.preprocessing import TextPreprocessor
+from src.model import SentimentModel
+from src.inference import load_compact
+
+
+def latencies_us(func, texts: list) -> np.ndarray:
+    """Latency of func on each text, in microseconds"""
+    timings = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        start = time.perf_counter()
+        func(text)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def report(name: str, timings: np.ndarray):
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"{name:<20} p50 {p50:9.1f} us   p99 {p99:9.1f} us   max {timings.max():9.1f} us")
+
+
+# Largest probability difference allowed between the compiled predictor and predict()
+PROBABILITY_TOLERANCE = 1e-9
+
+
+def check_predictor(model: SentimentModel, predictor, texts: list, name: str,
+                    min_agreement: float = 1.0, tolerance: float = None):
+    """
+    Exit unless predictor agrees with uncached predict() on at least
+    min_agreement of the texts and, if tolerance is given, every probability
+    is within tolerance
+    """
+    max_diff = 0.0
+    agreed = 0
+    for text in texts:
+        expected = model._predict_sklearn(text)
+        actual = predictor.predict(text)
+        agreed += expected['prediction'] == actual['prediction']
+        max_diff = max(max_diff, max(
+            abs(expected['probabilities'][label] - actual['probabilities'][label])
+            for label in expected['probabilities']
+        ))
+
+    agreement = agreed / len(texts)
+    if agreement < min_agreement:
+        print(f"FAILED: {name} agrees with predict() on {agreement:.2%} of texts "
+              f"(need {min_agreement:.2%})")
+        sys.exit(1)
+    if tolerance is not None and max_diff > tolerance:
+        print(f"FAILED: {name} probabilities differ from predict() by up to {max_diff:.2e} "
+              f"(tolerance {tolerance:.0e})")
+        sys.exit(1)
+    print(f"OK: {name} agrees on {agreement:.2%} of texts, "
+          f"max probability difference {max_diff:.2e}")
+
+
+def bench_load(model: SentimentModel, threshold: float):
+    """Compare size and load time of the joblib artifact and the compact export"""
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = Path(tmp) / 'model.joblib'
+        compact = Path(tmp) / 'model.npz'
+        model.save(artifact)
+        stats = model.export_compact(compact, threshold=threshold)
+
+        start = time.perf_counter()
+        SentimentModel.load(artifact)
+        artifact_secs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictor = load_compact(compact)
+        compact_secs = time.perf_counter() - start
+
+        print(f"joblib artifact  {artifact.stat().st_size:10,d} bytes   load {artifact_secs * 1e3:8.1f} ms")
+        print(f"compact export   {stats['file_bytes']:10,d} bytes   load {compact_secs * 1e3:8.1f} ms"
+              f"   ({stats['n_features_kept']:,d} of {stats['n_features_total']:,d} features kept)")
+
+    return predictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default='data/reviews.csv')
+    parser.add_argument('--n', type=int, default=5000, help='predictions per path')
+    parser.add_argument('--threshold', type=float, default=0.05,
+                        help='compact export prunes features below this fraction of the largest coefficient')
+    parser.add_argument('--min-agreement', type=float, default=0.99,
+                        help='share of compact predictions that must match predict()')
+    args = parser.parse_args()
+
+    df = TextPreprocessor().preprocess_dataframe(DataLoader(args.data).load_from_csv())
+    model = SentimentModel()
+    model.train(df['cleaned_text'], df['sentiment'])
+    predictor = model.compile()
+    compact = bench_load(model, args.threshold)
+
+    texts = df['cleaned_text'].sample(n=args.n, replace=True, random_state=42).tolist()
+
+    # Compiled results must match predict() before timing means anything. Both
+    # the check and the baseline bypass the prediction cache: the sampled texts
+    # repeat, so cached predict() would mostly time cache hits
+    check_predictor(model, predictor, texts[:1000], "compiled", tolerance=PROBABILITY_TOLERANCE)
+    check_predictor(model, compact, texts[:1000], "compact", args.min_agreement)
+
+    report("sklearn predict", latencies_us(model._predict_sklearn, texts))
+    report("compiled predict", latencies_us(predictor.predict, texts))
+    report("compact predict", latencies_us(compact.predict, texts))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_preprocessing.py - Check batch text cleaning against clean_text and time both
+
+Usage:
+    python benchmarks/bench_preprocessing.py [--data data/reviews.csv] [--repeat 5]
+        [--rows 200000] [--jobs 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data_loader import DataLoader
+from src.preprocessing import TextPreprocessor
+
+
+def check_equivalence(preprocessor: TextPreprocessor, texts: list) -> int:
+    """Compare clean_texts with clean_text row by row, return the number of mismatches"""
+    expected = [preprocessor.clean_text(text) for text in texts]
+    actual = preprocessor.clean_texts(texts)
+
+    mismatches = 0
+    for i, (exp, act) in enumerate(zip(expected, actual)):
+        if exp != act:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Row {i}: clean_text={exp!r} clean_texts={act!r}")
+
+    return mismatches
+
+
+def time_rows_per_sec(func, texts: list, repeat: int) -> float:
+    """Best-of-`repeat` throughput of func over texts"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def scale_dataframe(df: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    """Resample reviews with replacement to n_rows"""
+    return df.sample(n=n_rows, replace=True, random_state=42).reset_index(drop=True)
+
+
+def bench_parallel(preprocessor: TextPreprocessor, df: pd.DataFrame, jobs: list, chunksize: int):
+    """Time preprocess_dataframe for each worker count and print the scaling"""
+    baseline = None
+    for n_jobs in jobs:
+        if n_jobs == 1:
+            start = time.perf_counter()
+            preprocessor.preprocess_dataframe(df)
+            elapsed = time.perf_counter() - start
+        else:
+            with preprocessor.create_pool(n_jobs) as pool:
+                # Warm up the workers so pool startup is not timed
+                preprocessor.preprocess_dataframe(df.head(n_jobs), executor=pool, chunksize=1)
+                start = time.perf_counter()
+                preprocessor.preprocess_dataframe(df, executor=pool, chunksize=chunksize)
+                elapsed = time.perf_counter() - start
+
+        rate = len(df) / elapsed
+        baseline = baseline or rate
+        print(f"preprocess_dataframe n_jobs={n_jobs:<3} {rate:12,.0f} rows/sec ({rate / baseline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default='data/reviews.csv')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=200000,
+                        help='rows to resample the data to for the parallel benchmark')
+    parser.add_argument('--jobs', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--chunksize', type=int, default=10000)
+    args = parser.parse_args()
+
+    df = DataLoader(args.data).load_from_csv()
+    texts = df['text'].tolist()
+    preprocessor = TextPreprocessor()
+
+    mismatches = check_equivalence(preprocessor, texts)
+    if mismatches:
+        print(f"FAILED: {mismatches} of {len(texts)} rows differ")
+        sys.exit(1)
+    print(f"OK: clean_texts matches clean_text on all {len(texts)} rows")
+
+    row_rate = time_rows_per_sec(
+        lambda batch: [preprocessor.clean_text(text) for text in batch], texts, args.repeat)
+    batch_rate = time_rows_per_sec(preprocessor.clean_texts, texts, args.repeat)
+
+    print(f"clean_text  (per row): {row_rate:12,.0f} rows/sec")
+    print(f"clean_texts (batch):   {batch_rate:12,.0f} rows/sec ({batch_rate / row_rate:.1f}x)")
+
+    bench_parallel(preprocessor, scale_dataframe(df, args.rows), args.jobs, args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+bench_suite.py - Time and memory of the whole pipeline on synthetic corpora of growing size
+
+Every stage is run once per corpus size and reports wall time, throughput
+and peak memory allocated while it ran (tracemalloc). Results are written
+as JSON and can be compared against an earlier run.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000 1000000]
+        [--output results.json] [--baseline baseline.json] [--tolerance 0.15]
+        [--skip cross_validate wordcloud] [--no-memory]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import sklearn
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import generate_corpus
+from src.data_loader import DataLoader
+from src.preprocessing import TextPreprocessor
+from src.model import SentimentModel
+from src.visualization import Visualizer
+
+STAGES = ['load_csv', 'preprocess', 'train', 'predict', 'predict_batch',
+          'cross_validate', 'word_frequency', 'wordcloud']
+
+# Single-text predictions are timed on at most this many reviews
+PREDICT_SAMPLE = 2000
+
+
+def measure(func, n_items: int, trace_memory: bool = True):
+    """
+    Run func once and measure it
+
+    Returns:
+        (func's return value, dict with seconds, items_per_sec and peak_mb)
+    """
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 2 ** 20
+
+    return result, {
+        'seconds': seconds,
+        'items': n_items,
+        'items_per_sec': n_items / seconds if seconds > 0 else None,
+        'peak_mb': peak_mb
+    }
+
+
+def run_size(source, n_rows: int, skip: set, trace_memory: bool, workdir: Path) -> dict:
+    """Run every stage not in `skip` on a synthetic corpus of n_rows reviews"""
+    csv_path = workdir / f'reviews_{n_rows}.csv'
+    generate_corpus(source, n_rows).to_csv(csv_path, index=False)
+
+    preprocessor = TextPreprocessor()
+    model = SentimentModel()
+    viz = Visualizer()
+    results = {}
+
+    def record(stage, func, n_items):
+        value, stats = measure(func, n_items, trace_memory)
+        results[stage] = stats
+        print(f"  {stage:<15} {stats['seconds']:9.3f} s  {stats['items_per_sec'] or 0:14,.0f} items/s"
+              + (f"  peak {stats['peak_mb']:9.1f} MB" if stats['peak_mb'] is not None else ''))
+        return value
+
+    # Later stages need the output of these, so they always run
+    df = record('load_csv', DataLoader(str(csv_path)).load_from_csv, n_rows)
+    df = record('preprocess', lambda: preprocessor.preprocess_dataframe(df), n_rows)
+    texts = df['cleaned_text']
+    record('train', lambda: model.train(texts, df['sentiment']), n_rows)
+
+    if 'predict' not in skip:
+        # Bypass the prediction cache: the synthetic corpus repeats texts
+        sample = texts.head(PREDICT_SAMPLE).tolist()
+        record('predict', lambda: [model._predict_sklearn(text) for text in sample], len(sample))
+
+    if 'predict_batch' not in skip:
+        record('predict_batch', lambda: model.predict_batch(texts), n_rows)
+
+    if 'cross_validate' not in skip:
+        record('cross_validate', lambda: model.cross_validate(texts, df['sentiment'], cv=3), n_rows)
+
+    if 'word_frequency' not in skip:
+        record('word_frequency', lambda: preprocessor.get_word_frequency(texts.tolist()), n_rows)
+
+    if 'wordcloud' not in skip:
+        # Same path as the dashboard: token counts -> frequencies -> PNG
+        record('wordcloud', lambda: viz.create_wordcloud_png(
+            viz.wordcloud_frequencies(Counter(chain.from_iterable(texts.str.split())))), n_rows)
+
+    return results
+
+
+def environment() -> dict:
+    """Describe the machine and code version so runs can be told apart"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Print per-stage time ratios against a baseline run
+
+    Returns:
+        List of (size, stage, ratio) for stages slower than 1 + tolerance
+    """
+    if results['trace_memory'] != baseline.get('trace_memory'):
+        print("Warning: tracemalloc setting differs from the baseline, timings are not comparable")
+
+    regressions = []
+    print(f"\n{'size':>9} {'stage':<15} {'baseline s':>11} {'current s':>11} {'ratio':>7}")
+    for size, stages in results['sizes'].items():
+        for stage, stats in stages.items():
+            base = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if base is None:
+                continue
+
+            ratio = stats['seconds'] / base['seconds']
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  SLOWER'
+                regressions.append((size, stage, ratio))
+            elif ratio < 1 - tolerance:
+                flag = '  faster'
+            print(f"{size:>9} {stage:<15} {base['seconds']:11.3f} {stats['seconds']:11.3f} {ratio:7.2f}{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default='data/reviews.csv', help='reviews to build corpora from')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--skip', nargs='*', default=[], choices=STAGES[3:],
+                        help='optional stages to leave out')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not trace memory (tracemalloc slows Python-heavy stages)')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    source = DataLoader(args.data).load_from_csv()
+    results = {
+        'environment': environment(),
+        'trace_memory': not args.no_memory,
+        'sizes': {}
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            print(f"{n_rows:,d} rows")
+            results['sizes'][str(n_rows)] = run_size(
+                source, n_rows, set(args.skip), not args.no_memory, Path(tmp))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than "
+                  f"{args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+corpus.py - Synthetic review corpora of any size for benchmarking
+
+Reviews are built by recombining sentences of same-sentiment reviews from
+data/reviews.csv, so vocabulary, review length and class balance stay close
+to the real data while no review is a plain duplicate.
+
+Usage:
+    python benchmarks/corpus.py --rows 100000 --output /tmp/reviews_100k.csv
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.data_loader import DataLoader
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Synthetic reviews have between 1 and MAX_SENTENCES sentences
+MAX_SENTENCES = 4
+
+
+def generate_corpus(source: pd.DataFrame, n_rows: int, random_state: int = 42) -> pd.DataFrame:
+    """
+    Generate n_rows synthetic reviews from the sentences of `source`
+
+    Args:
+        source: DataFrame with 'text' and 'sentiment' columns
+        n_rows: Number of reviews to generate
+        random_state: Seed, the same seed always gives the same corpus
+
+    Returns:
+        DataFrame with 'text' and 'sentiment' columns
+    """
+    rng = np.random.default_rng(random_state)
+
+    class_shares = source['sentiment'].value_counts(normalize=True).sort_index()
+    sentiments = rng.choice(class_shares.index.to_numpy(), size=n_rows, p=class_shares.to_numpy())
+    texts = np.empty(n_rows, dtype=object)
+
+    for sentiment in class_shares.index:
+        reviews = source.loc[source['sentiment'] == sentiment, 'text']
+        sentences = np.array([
+            sentence
+            for review in reviews
+            for sentence in SENTENCE_SPLIT.split(review.strip())
+            if sentence
+        ], dtype=object)
+
+        rows = np.flatnonzero(sentiments == sentiment)
+        lengths = rng.integers(1, MAX_SENTENCES + 1, size=len(rows))
+        picks = sentences[rng.integers(0, len(sentences), size=lengths.sum())]
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+
+        texts[rows] = [' '.join(picks[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    return pd.DataFrame({'text': texts, 'sentiment': sentiments})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default='data/reviews.csv')
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(DataLoader(args.data).load_from_csv(), args.rows, args.seed)
+    corpus.to_csv(args.output, index=False)
+    print(f"Wrote {len(corpus):,d} reviews to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
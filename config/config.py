@@ -1,6 +1,7 @@
 """
 config.py - Configuration settings for Fashion Review Dashboard (UPDATED COLORS)
 """
+import os
 from pathlib import Path
 
 # Paths
@@ -8,13 +9,56 @@ BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 REVIEWS_CSV = DATA_DIR / "reviews.csv"
 PREPROCESSED_CSV = DATA_DIR / "preprocessed_reviews.csv"
+CACHE_DIR = BASE_DIR / ".cache"
+PREPROCESSED_CACHE = CACHE_DIR / "preprocessed_reviews.feather"
+LEMMA_CACHE = CACHE_DIR / "lemma_cache.json"
+WORDCLOUD_CACHE_DIR = CACHE_DIR / "wordclouds"
+MODEL_DIR = BASE_DIR / "models"
+MODEL_ARTIFACT = MODEL_DIR / "sentiment_model.joblib"
 
 # Model settings
 MODEL_CONFIG = {
     'test_size': 0.2,
     'random_state': 42,
     'max_features': 5000,
-    'ngram_range': (1, 2)
+    'ngram_range': (1, 2),
+    'prediction_cache_size': 1024,
+    'prediction_cache_ttl': 3600,  # seconds
+    'lean': True  # float32 features, no retained train/test matrices
+}
+
+# Preprocessing settings
+PREPROCESSING_CONFIG = {
+    'lemma_cache_size': 50000,
+    'n_jobs': 1,        # worker processes for cold-start preprocessing (-1 = all cores)
+    'chunksize': 10000
+}
+
+# HTTP inference service (service.py)
+SERVICE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8000,
+    'max_batch_size': 64,        # single /predict requests merged into one model call
+    'max_wait_ms': 5,            # longest a request waits for its batch to fill
+    'preprocess_workers': 2,     # worker processes running clean_text
+    'max_request_texts': 10000,  # texts accepted by one /predict_batch call
+    'max_body_bytes': 10 * 2 ** 20
+}
+
+# Instrumentation - off unless FASHION_INSTRUMENTATION is set ("1", or "memory" to also trace allocations)
+INSTRUMENTATION_CONFIG = {
+    'enabled': os.environ.get('FASHION_INSTRUMENTATION', '') in ('1', 'memory'),
+    'trace_memory': os.environ.get('FASHION_INSTRUMENTATION', '') == 'memory',
+    'dump_path': os.environ.get('FASHION_INSTRUMENTATION_DUMP'),  # JSON rewritten after every rerun
+    'max_samples': 5000
+}
+
+# Review browser (src/browser.py)
+BROWSER_CONFIG = {
+    'page_size': 10,
+    'random_state': 42,       # seed of the sampling permutations
+    'scan_block': 4096,       # rows tested per step of a keyword scan
+    'cursor_cache_size': 256  # keyword queries whose page positions are remembered
 }
 
 # Streamlit page config - Fashion Theme
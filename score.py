@@ -0,0 +1,280 @@
+"""
+score.py - Bulk-score a review file with the saved model
+
+Streams a CSV (needs a 'text' column) or structured TXT file in chunks,
+cleans each chunk across a process pool while the previous one is scored,
+and appends predictions and class probabilities to a CSV file or to a
+directory of Parquet part files. After every chunk a checkpoint is written
+next to the output, so an interrupted run picks up after the last completed
+chunk when started again with the same arguments.
+
+Usage:
+    python score.py INPUT OUTPUT [--format csv|parquet] [--model models/sentiment_model.joblib]
+        [--chunksize 50000] [--jobs -1] [--engine c|pyarrow] [--no-text] [--restart]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import pandas as pd
+
+from src.data_loader import DataLoader
+from src.preprocessing import TextPreprocessor, clean_chunk
+from src.model import SentimentModel
+from config.config import MODEL_ARTIFACT, PREPROCESSING_CONFIG
+
+# Bump whenever the checkpoint layout changes
+CHECKPOINT_VERSION = 1
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Chunks being cleaned in the pool while an earlier chunk is scored and written
+PREFETCH_CHUNKS = 2
+
+
+def iter_input_chunks(input_path: Path, chunksize: int, engine: str = None, errors: str = 'drop'):
+    """Stream an unlabeled CSV or TXT review file as DataFrames indexed by review position"""
+    loader = DataLoader(str(input_path))
+
+    if input_path.suffix.lower() == '.txt':
+        return loader.iter_txt_batches(str(input_path), batch_size=chunksize, use_mmap=True,
+                                       require_sentiment=False)
+
+    return loader.iter_csv_chunks(chunksize=chunksize, engine=engine, errors=errors,
+                                  require_sentiment=False)
+
+
+def file_fingerprint(path: Path) -> dict:
+    """Cheap identity of a file, to detect that it changed between runs"""
+    stat = path.stat()
+    return {'path': str(path.resolve()), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class Checkpoint:
+    """Progress of a scoring run, saved atomically after every chunk"""
+
+    def __init__(self, path: Path, run: dict):
+        """
+        Args:
+            path: Checkpoint file
+            run: Settings that must match for a run to be resumed
+        """
+        self.path = path
+        self.run = run
+        self.completed_chunks = 0
+        self.rows_written = 0
+        self.output_bytes = 0
+
+    def resume(self) -> bool:
+        """Load progress from a previous run with the same settings, if there is one"""
+        if not self.path.exists():
+            return False
+
+        with open(self.path) as f:
+            state = json.load(f)
+
+        if state.get('version') != CHECKPOINT_VERSION or state.get('run') != self.run:
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to a different input, model or settings. "
+                "Run with --restart to start over."
+            )
+
+        self.completed_chunks = state['completed_chunks']
+        self.rows_written = state['rows_written']
+        self.output_bytes = state['output_bytes']
+        return True
+
+    def save(self):
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'run': self.run,
+            'completed_chunks': self.completed_chunks,
+            'rows_written': self.rows_written,
+            'output_bytes': self.output_bytes
+        }
+
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+class CSVOutput:
+    """Append scored chunks to one CSV file"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def open(self, checkpoint: Checkpoint):
+        """Open for appending, dropping anything written after the last checkpoint"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if checkpoint.completed_chunks:
+            with open(self.path, 'r+b') as f:
+                f.truncate(checkpoint.output_bytes)
+        self._file = open(self.path, 'a' if checkpoint.completed_chunks else 'w',
+                          encoding='utf-8', newline='')
+
+    def write(self, frame: pd.DataFrame, chunk_index: int) -> int:
+        """Write one chunk durably, returning the output size in bytes"""
+        frame.to_csv(self._file, index=False, header=self._file.tell() == 0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetOutput:
+    """Write each scored chunk as its own part file in an output directory"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def open(self, checkpoint: Checkpoint):
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not checkpoint.completed_chunks:
+            for part in self.path.glob('part-*.parquet'):
+                part.unlink()
+
+    def write(self, frame: pd.DataFrame, chunk_index: int) -> int:
+        part = self.path / f'part-{chunk_index:05d}.parquet'
+        tmp_path = part.with_suffix('.parquet.tmp')
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part)
+        return 0
+
+    def close(self):
+        pass
+
+
+def score_chunk(model: SentimentModel, chunk: pd.DataFrame, cleaned: list, keep_text: bool) -> pd.DataFrame:
+    """Input columns of a chunk plus prediction, confidence and prob_<class> columns"""
+    scores = model.predict_batch(pd.Series(cleaned, index=chunk.index), as_frame=True)
+
+    frame = chunk if keep_text else chunk.drop(columns='text')
+    if 'sentiment' in frame.columns:
+        # Same dtype in every chunk, whether or not it has labels
+        frame = frame.assign(sentiment=frame['sentiment'].astype('string'))
+
+    frame = pd.concat([frame, scores], axis=1)
+    frame.insert(0, 'row', chunk.index)
+    return frame
+
+
+def score_file(args):
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+    model_path = Path(args.model)
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    checkpoint = Checkpoint(
+        output_path.with_name(output_path.name + '.checkpoint.json'),
+        run={
+            'input': file_fingerprint(input_path),
+            'model': file_fingerprint(model_path),
+            'output': str(output_path.resolve()),
+            'format': args.format,
+            'chunksize': args.chunksize,
+            'errors': args.errors,
+            'keep_text': not args.no_text
+        }
+    )
+    if args.restart:
+        checkpoint.clear()
+    elif checkpoint.resume():
+        print(f"Resuming after chunk {checkpoint.completed_chunks} "
+              f"({checkpoint.rows_written:,d} rows already written)", file=sys.stderr)
+
+    model = SentimentModel.load(str(model_path))
+    preprocessor = TextPreprocessor(lemma_cache_size=PREPROCESSING_CONFIG['lemma_cache_size'])
+    workers = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    output = CSVOutput(output_path) if args.format == 'csv' else ParquetOutput(output_path)
+
+    start = time.perf_counter()
+    rows_this_run = 0
+
+    def finish(chunk_index, chunk, futures):
+        nonlocal rows_this_run
+        cleaned = [text for future in futures for text in future.result()]
+        output_bytes = output.write(score_chunk(model, chunk, cleaned, not args.no_text), chunk_index)
+
+        # Only count a chunk as done once its output is on disk
+        checkpoint.completed_chunks = chunk_index + 1
+        checkpoint.rows_written += len(chunk)
+        checkpoint.output_bytes = output_bytes
+        checkpoint.save()
+
+        rows_this_run += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"chunk {chunk_index + 1:>6,d}   {checkpoint.rows_written:>14,d} rows   "
+              f"{rows_this_run / elapsed:>10,.0f} rows/s", file=sys.stderr, flush=True)
+
+    output.open(checkpoint)
+    try:
+        with preprocessor.create_pool(workers) as pool:
+            pending = deque()
+            chunks = iter_input_chunks(input_path, args.chunksize, args.engine, args.errors)
+
+            for chunk_index, chunk in enumerate(chunks):
+                if chunk_index < checkpoint.completed_chunks:
+                    continue
+
+                texts = chunk['text'].tolist()
+                step = max(1, math.ceil(len(texts) / workers))
+                futures = [pool.submit(clean_chunk, texts[i:i + step])
+                           for i in range(0, len(texts), step)]
+                pending.append((chunk_index, chunk, futures))
+
+                if len(pending) > PREFETCH_CHUNKS:
+                    finish(*pending.popleft())
+
+            while pending:
+                finish(*pending.popleft())
+    finally:
+        output.close()
+
+    checkpoint.clear()
+    elapsed = time.perf_counter() - start
+    print(f"Scored {checkpoint.rows_written:,d} rows into {output_path} "
+          f"({rows_this_run / elapsed if elapsed else 0:,.0f} rows/s this run)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('input', help='CSV with a text column, or structured TXT file')
+    parser.add_argument('output', help='CSV file, or directory of Parquet parts with --format parquet')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--model', default=str(MODEL_ARTIFACT))
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--jobs', type=int, default=-1, help='cleaning processes (-1 for all cores)')
+    parser.add_argument('--engine', choices=['c', 'python', 'pyarrow'], default=None,
+                        help='CSV parser')
+    parser.add_argument('--errors', choices=['raise', 'drop'], default='drop',
+                        help='what to do with rows that have no text')
+    parser.add_argument('--no-text', action='store_true', help='leave review text out of the output')
+    parser.add_argument('--restart', action='store_true', help='ignore any checkpoint and start over')
+    args = parser.parse_args()
+
+    try:
+        score_file(args)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+"""
+service.py - HTTP inference service with micro-batching
+
+Loads the saved model artifact once and serves predictions over HTTP/1.1
+with keep-alive. Concurrent /predict requests are merged into micro-batches
+so the model scores many reviews per call, and review cleaning runs in a
+pool of worker processes so the event loop stays responsive.
+
+Usage:
+    python service.py [--host 127.0.0.1] [--port 8000] [--model models/sentiment_model.joblib]
+        [--max-batch-size 64] [--max-wait-ms 5] [--workers 2]
+
+Endpoints:
+    POST /predict        {"text": "..."}          -> {"prediction", "probabilities", "confidence"}
+    POST /predict_batch  {"texts": ["...", ...]}  -> {"results": [...]}
+    GET  /health                                  -> {"status", "model_version", ...}
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import traceback
+
+from src.preprocessing import TextPreprocessor, clean_chunk
+from src.model import SentimentModel
+from config.config import MODEL_ARTIFACT, PREPROCESSING_CONFIG, SERVICE_CONFIG
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error'
+}
+
+# Texts smaller than this are cleaned by one worker instead of being split up
+MIN_PREPROCESS_CHUNK = 256
+
+
+class HTTPError(Exception):
+    """Request failure reported to the client with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def batch_to_results(batch: dict) -> list:
+    """Turn the arrays of SentimentModel.predict_batch into one predict()-style dict per text"""
+    classes = [str(label) for label in batch['classes']]
+    return [
+        {
+            'prediction': str(prediction),
+            'probabilities': dict(zip(classes, map(float, probabilities))),
+            'confidence': float(confidence)
+        }
+        for prediction, probabilities, confidence in zip(
+            batch['predictions'], batch['probabilities'], batch['confidence'])
+    ]
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-text requests into batches
+
+    A batch is sent to `handler` once it holds max_batch_size texts or the
+    first text in it has waited max_wait_ms, whichever comes first. Up to
+    max_inflight batches are scored at the same time.
+    """
+
+    def __init__(self, handler, max_batch_size: int = 64, max_wait_ms: float = 5,
+                 max_inflight: int = 2):
+        """
+        Args:
+            handler: Coroutine function scoring a list of texts, returning
+                one result per text
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        if max_inflight <= 0:
+            raise ValueError("max_inflight must be positive")
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_inflight = max_inflight
+        self.batches = 0
+        self.batched_texts = 0
+        self._queue = None
+        self._inflight = None
+        self._task = None
+
+        # asyncio only keeps weak references to tasks, so batches being scored are held here
+        self._scoring = set()
+
+    def start(self):
+        """Start collecting batches on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        self._task = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        """Stop collecting, let batches being scored finish and fail any still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await asyncio.gather(*self._scoring, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            self._fail([self._queue.get_nowait()])
+
+    @staticmethod
+    def _fail(batch: list):
+        """Fail the requests of a batch that will never be scored"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Service is shutting down"))
+
+    async def submit(self, text: str):
+        """Score one text as part of the next batch"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Requests keep queueing up for the next batch while this one is scored
+                await self._inflight.acquire()
+            except asyncio.CancelledError:
+                self._fail(batch)
+                raise
+
+            task = asyncio.create_task(self._score(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    async def _score(self, batch: list):
+        self.batches += 1
+        self.batched_texts += len(batch)
+
+        try:
+            results = await self.handler([text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._inflight.release()
+
+
+class InferenceService:
+    """Score reviews with a loaded model and serve the results over HTTP"""
+
+    def __init__(self, model: SentimentModel, pool, workers: int,
+                 max_batch_size: int = SERVICE_CONFIG['max_batch_size'],
+                 max_wait_ms: float = SERVICE_CONFIG['max_wait_ms'],
+                 max_request_texts: int = SERVICE_CONFIG['max_request_texts'],
+                 max_body_bytes: int = SERVICE_CONFIG['max_body_bytes']):
+        """
+        Args:
+            model: Fitted model
+            pool: Executor from TextPreprocessor.create_pool() to clean texts in
+            workers: Number of workers in the pool
+        """
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+
+        self.model = model
+        self.pool = pool
+        self.workers = workers
+        self.max_request_texts = max_request_texts
+        self.max_body_bytes = max_body_bytes
+        self.batcher = MicroBatcher(self.score, max_batch_size, max_wait_ms, max_inflight=workers)
+
+    async def score(self, texts: list) -> list:
+        """Clean texts in the worker pool, then score them in one model call"""
+        loop = asyncio.get_running_loop()
+
+        chunksize = max(MIN_PREPROCESS_CHUNK, math.ceil(len(texts) / self.workers))
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self.pool, clean_chunk, texts[i:i + chunksize])
+            for i in range(0, len(texts), chunksize)
+        ))
+        cleaned = [text for chunk in chunks for text in chunk]
+
+        # Scoring releases the GIL in numpy/scipy; keep it off the event loop
+        batch = await loop.run_in_executor(None, self.model.predict_batch, cleaned)
+        return batch_to_results(batch)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as exc:
+                    # The rest of the request was not read, so the connection can't be reused
+                    self._write_response(writer, exc.status, {'error': exc.message}, keep_alive=False)
+                    await writer.drain()
+                    break
+
+                if request is None:
+                    break
+
+                method, path, keep_alive, body = request
+                status, payload = await self._dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Read one request, returning (method, path, keep_alive, body) or None at end of stream"""
+        # readline raises ValueError when a line is longer than the stream limit
+        try:
+            request_line = await reader.readline()
+        except ValueError:
+            raise HTTPError(400, "Request line too long")
+        if not request_line.strip():
+            return None
+
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise HTTPError(431, "Header line too long")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Request body larger than {self.max_body_bytes} bytes")
+
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+        return method.upper(), target.split('?', 1)[0], keep_alive, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        """Route a request, returning (status, JSON payload)"""
+        routes = {
+            '/predict': ('POST', self._predict),
+            '/predict_batch': ('POST', self._predict_batch),
+            '/health': ('GET', self._health)
+        }
+
+        try:
+            if path not in routes:
+                raise HTTPError(404, f"Unknown endpoint {path}")
+
+            allowed, handler = routes[path]
+            if method != allowed:
+                raise HTTPError(405, f"{path} only accepts {allowed}")
+
+            return 200, await handler(body)
+        except HTTPError as exc:
+            return exc.status, {'error': exc.message}
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            return 500, {'error': "Internal server error"}
+
+    @staticmethod
+    def _parse_json(body: bytes) -> dict:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+    async def _predict(self, body: bytes) -> dict:
+        text = self._parse_json(body).get('text')
+        if not isinstance(text, str):
+            raise HTTPError(400, "'text' must be a string")
+        return await self.batcher.submit(text)
+
+    async def _predict_batch(self, body: bytes) -> dict:
+        texts = self._parse_json(body).get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise HTTPError(400, "'texts' must be a list of strings")
+        if len(texts) > self.max_request_texts:
+            raise HTTPError(413, f"At most {self.max_request_texts} texts per request")
+
+        return {'results': await self.score(texts) if texts else []}
+
+    async def _health(self, body: bytes) -> dict:
+        return {
+            'status': 'ok',
+            'model_version': self.model.model_version,
+            'batches': self.batcher.batches,
+            'mean_batch_size': (self.batcher.batched_texts / self.batcher.batches
+                                if self.batcher.batches else 0.0)
+        }
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+
+
+async def serve(args):
+    try:
+        model = SentimentModel.load(args.model)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"Could not load model: {exc}\nRun the dashboard once to train and save it.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    preprocessor = TextPreprocessor(lemma_cache_size=PREPROCESSING_CONFIG['lemma_cache_size'])
+
+    with preprocessor.create_pool(args.workers) as pool:
+        service = InferenceService(
+            model, pool, args.workers,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms
+        )
+
+        # Start every worker before accepting traffic so the first requests are not slow
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(pool, clean_chunk, ['warm up'])
+            for _ in range(args.workers)
+        ))
+
+        service.batcher.start()
+        server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port} "
+              f"(batch size {args.max_batch_size}, max wait {args.max_wait_ms} ms, "
+              f"{args.workers} workers)")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default=SERVICE_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVICE_CONFIG['port'])
+    parser.add_argument('--model', default=str(MODEL_ARTIFACT))
+    parser.add_argument('--max-batch-size', type=int, default=SERVICE_CONFIG['max_batch_size'])
+    parser.add_argument('--max-wait-ms', type=float, default=SERVICE_CONFIG['max_wait_ms'])
+    parser.add_argument('--workers', type=int, default=SERVICE_CONFIG['preprocess_workers'],
+                        help='cleaning processes (0 or less for all cores)')
+    args = parser.parse_args()
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
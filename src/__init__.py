@@ -6,6 +6,9 @@ from .data_loader import DataLoader
 from .preprocessing import TextPreprocessor
 from .model import SentimentModel
 from .visualization import Visualizer
+from .cache import PreprocessedCache
+from .inference import CompiledPredictor, load_compact
 
-__all__ = ['DataLoader', 'TextPreprocessor', 'SentimentModel', 'Visualizer']
+__all__ = ['DataLoader', 'TextPreprocessor', 'SentimentModel', 'Visualizer', 'PreprocessedCache',
+           'CompiledPredictor', 'load_compact']
 __version__ = '1.0.0'
\ No newline at end of file
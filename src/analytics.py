@@ -0,0 +1,97 @@
+"""
+analytics.py - Corpus statistics computed once per dataset version
+"""
+from collections import Counter
+import pandas as pd
+
+# Most frequent tokens precomputed per sentiment
+DEFAULT_TOP_K = 100
+
+
+class AnalyticsSnapshot:
+    """
+    Token counts, class counts and review lengths of a preprocessed corpus
+
+    Built once from the DataFrame and then only read, so dashboard reruns
+    cost the same whatever the corpus size. Token statistics are keyed by
+    sentiment label, with 'all' for the whole corpus. word_counts holds each
+    sentiment's review lengths for charts that need the distribution, such
+    as Visualizer.create_word_length_boxplot.
+    """
+
+    def __init__(self, version: str, n_reviews: int, class_counts: pd.Series, token_counts: dict,
+                 top_tokens: dict, length_stats: dict, word_counts: dict):
+        self.version = version
+        self.n_reviews = n_reviews
+        self.class_counts = class_counts
+        self.token_counts = token_counts
+        self.top_tokens = top_tokens
+        self.length_stats = length_stats
+        self.word_counts = word_counts
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, version: str = None, text_column: str = 'cleaned_text',
+                       label_column: str = 'sentiment', top_k: int = DEFAULT_TOP_K) -> 'AnalyticsSnapshot':
+        """
+        Compute the snapshot of a preprocessed DataFrame
+
+        Args:
+            df: Output of TextPreprocessor.preprocess_dataframe
+            version: Identifier of the dataset, e.g. its preprocessing cache key
+            text_column: Column of cleaned, space-separated tokens
+            label_column: Sentiment column
+            top_k: Number of most frequent tokens to precompute per sentiment
+        """
+        labels = df[label_column].astype(str)
+
+        # Cleaned text is already word_tokenize output joined by spaces, so a
+        # whitespace split gives the same tokens as tokenizing it again. Rows
+        # are counted one at a time so only one row's tokens exist at once, in
+        # corpus order so ties rank like nltk.FreqDist on the joined text
+        token_counts = {'all': Counter()}
+        for text, label in zip(df[text_column], labels):
+            tokens = text.split()
+            token_counts['all'].update(tokens)
+            counts = token_counts.get(label)
+            if counts is None:
+                counts = token_counts[label] = Counter()
+            counts.update(tokens)
+
+        lengths = {'all': df}
+        lengths.update(dict(tuple(df.groupby(labels, sort=False))))
+
+        return cls(
+            version=version,
+            n_reviews=len(df),
+            class_counts=df[label_column].value_counts(),
+            token_counts=token_counts,
+            top_tokens={label: counts.most_common(top_k) for label, counts in token_counts.items()},
+            length_stats={
+                label: {
+                    'reviews': len(group),
+                    'avg_words': float(group['word_count'].mean()),
+                    'median_words': float(group['word_count'].median()),
+                    'min_words': int(group['word_count'].min()),
+                    'max_words': int(group['word_count'].max()),
+                    'avg_chars': float(group['char_count'].mean())
+                }
+                for label, group in lengths.items()
+            },
+            word_counts={
+                label: group['word_count'].to_numpy()
+                for label, group in lengths.items()
+                if label != 'all'
+            }
+        )
+
+    def top_words(self, sentiment: str = 'all', n: int = 20) -> dict:
+        """Most frequent tokens and their counts, most frequent first"""
+        top = self.top_tokens.get(sentiment, [])
+        if n > len(top) and len(top) < len(self.token_counts.get(sentiment, ())):
+            top = self.token_counts[sentiment].most_common(n)
+        return dict(top[:n])
+
+    def lengths(self, sentiment: str = 'all') -> dict:
+        """Review length statistics of a sentiment, or an empty dict if it has no reviews"""
+        return self.length_stats.get(sentiment, {})
+
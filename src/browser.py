@@ -0,0 +1,200 @@
+"""
+browser.py - Paginated, filtered and sampled access to a review DataFrame
+"""
+import re
+import numpy as np
+import pandas as pd
+from .cache import LRUCache
+
+# Rows tested per step of a keyword scan
+DEFAULT_SCAN_BLOCK = 4096
+
+# Keyword queries whose page positions are remembered
+DEFAULT_CURSOR_CACHE_SIZE = 256
+
+
+class ReviewBrowser:
+    """
+    Pages, filters and random samples of reviews without full-table masks
+
+    Row positions are grouped once per sentiment ('all' for every review),
+    sorted by word count and shuffled, so a page or a sample only touches the
+    rows it returns. Length ranges are resolved with a binary search on the
+    sorted word counts. Keyword filters scan candidate rows lazily, stopping
+    as soon as a page is full, and remember where each page started so later
+    pages continue the scan instead of repeating it.
+    """
+
+    def __init__(self, df: pd.DataFrame, text_column: str = 'text', label_column: str = 'sentiment',
+                 random_state: int = 42, scan_block: int = DEFAULT_SCAN_BLOCK,
+                 cursor_cache_size: int = DEFAULT_CURSOR_CACHE_SIZE):
+        """
+        Args:
+            df: Reviews with text, sentiment and word_count columns
+            text_column: Column searched by keyword filters
+            label_column: Sentiment column
+            random_state: Seed of the sampling permutations
+            scan_block: Rows tested per step of a keyword scan
+            cursor_cache_size: Keyword queries whose page positions are remembered
+        """
+        if scan_block <= 0:
+            raise ValueError("scan_block must be positive")
+
+        self.df = df
+        self.text_column = text_column
+        self.scan_block = scan_block
+        self._texts = df[text_column].to_numpy()
+        self._cursors = LRUCache(maxsize=cursor_cache_size)
+
+        dtype = np.int32 if len(df) < 2 ** 31 else np.int64
+        codes, labels = pd.factorize(df[label_column].astype(str), sort=True)
+        order = np.argsort(codes, kind='stable').astype(dtype)
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+
+        self.positions = {'all': np.arange(len(df), dtype=dtype)}
+        for i, label in enumerate(labels):
+            self.positions[label] = order[bounds[i]:bounds[i + 1]]
+
+        word_counts = df['word_count'].to_numpy()
+        rng = np.random.default_rng(random_state)
+        self._by_length = {}
+        self._sorted_lengths = {}
+        self._permutations = {}
+
+        for label, positions in self.positions.items():
+            by_length = positions[np.argsort(word_counts[positions], kind='stable')]
+            self._by_length[label] = by_length
+            self._sorted_lengths[label] = word_counts[by_length]
+            self._permutations[label] = rng.permutation(positions)
+
+    def count(self, sentiment: str = 'all', min_words: int = None, max_words: int = None) -> int:
+        """Number of reviews of a sentiment within a word-count range"""
+        return len(self._candidates(sentiment, min_words, max_words))
+
+    def _candidates(self, sentiment: str, min_words: int = None, max_words: int = None) -> np.ndarray:
+        """
+        Row positions of a sentiment, optionally limited to a word-count range
+
+        Without a range rows keep their DataFrame order; with one they are
+        ordered by word count.
+        """
+        if sentiment not in self.positions:
+            return self.positions['all'][:0]
+
+        if min_words is None and max_words is None:
+            return self.positions[sentiment]
+
+        lengths = self._sorted_lengths[sentiment]
+        lo = 0 if min_words is None else np.searchsorted(lengths, min_words, side='left')
+        hi = len(lengths) if max_words is None else np.searchsorted(lengths, max_words, side='right')
+        return self._by_length[sentiment][lo:max(lo, hi)]
+
+    def page(self, page: int = 0, page_size: int = 10, sentiment: str = 'all', keyword: str = None,
+             min_words: int = None, max_words: int = None) -> dict:
+        """
+        One page of reviews matching the filters
+
+        Args:
+            page: Zero-based page number
+            page_size: Reviews per page
+            sentiment: Sentiment label, or 'all'
+            keyword: Case-insensitive substring the review text must contain
+            min_words: Smallest word count to include
+            max_words: Largest word count to include
+
+        Returns:
+            dict with 'rows' (DataFrame slice), 'page', 'page_size',
+            'has_next' and 'total' (None while a keyword scan has not
+            reached the end of the candidates)
+        """
+        if page < 0 or page_size <= 0:
+            raise ValueError("page must be >= 0 and page_size positive")
+
+        candidates = self._candidates(sentiment, min_words, max_words)
+        keyword = (keyword or '').strip()
+
+        if not keyword:
+            start = page * page_size
+            return {
+                'rows': self.df.iloc[candidates[start:start + page_size]],
+                'page': page,
+                'page_size': page_size,
+                'has_next': start + page_size < len(candidates),
+                'total': len(candidates)
+            }
+
+        positions, has_next, total = self._keyword_page(
+            candidates, (sentiment, min_words, max_words, keyword.lower(), page_size),
+            re.compile(re.escape(keyword), re.IGNORECASE), page, page_size
+        )
+        return {
+            'rows': self.df.iloc[positions],
+            'page': page,
+            'page_size': page_size,
+            'has_next': has_next,
+            'total': total
+        }
+
+    def _keyword_page(self, candidates: np.ndarray, key: tuple, pattern, page: int, page_size: int):
+        """Scan for one page of keyword matches, resuming from the nearest known page start"""
+        # starts[p] is the candidate offset page p's scan begins at; total is
+        # set once a scan has reached the end of the candidates
+        state = self._cursors.get(key) or {'starts': [0], 'total': None}
+        starts = list(state['starts'])
+        total = state['total']
+
+        # Pages before the requested one are scanned without keeping their rows
+        while len(starts) <= page:
+            matches, ends = self._scan(candidates, pattern, starts[-1], page_size + 1)
+            if len(matches) <= page_size:
+                total = (len(starts) - 1) * page_size + len(matches)
+                self._cursors.put(key, {'starts': starts, 'total': total})
+                return candidates[:0], False, total
+            starts.append(ends[page_size - 1])
+
+        matches, ends = self._scan(candidates, pattern, starts[page], page_size + 1)
+        has_next = len(matches) > page_size
+        if has_next and page + 1 == len(starts):
+            starts.append(ends[page_size - 1])
+        elif not has_next:
+            total = page * page_size + len(matches)
+
+        self._cursors.put(key, {'starts': starts, 'total': total})
+        return np.asarray(matches[:page_size], dtype=candidates.dtype), has_next, total
+
+    def _scan(self, candidates: np.ndarray, pattern, offset: int, limit: int):
+        """
+        Find up to `limit` matching rows from candidate offset `offset` on
+
+        Returns:
+            (row positions of the matches, candidate offset just after each match)
+        """
+        matches, ends = [], []
+        while offset < len(candidates):
+            block = candidates[offset:offset + self.scan_block]
+            for i, text in enumerate(self._texts[block]):
+                if isinstance(text, str) and pattern.search(text):
+                    matches.append(block[i])
+                    ends.append(offset + i + 1)
+                    if len(matches) == limit:
+                        return matches, ends
+            offset += len(block)
+        return matches, ends
+
+    def sample(self, n: int = 5, sentiment: str = 'all', draw: int = 0) -> pd.DataFrame:
+        """
+        n random reviews of a sentiment
+
+        Consecutive draws walk through a fixed shuffle, so they don't repeat
+        reviews until every review of the sentiment has been shown.
+        """
+        permutation = self._permutations.get(sentiment)
+        if permutation is None or not len(permutation) or n <= 0:
+            return self.df.iloc[:0]
+
+        n = min(n, len(permutation))
+        start = (draw * n) % len(permutation)
+        positions = permutation[start:start + n]
+        if len(positions) < n:
+            positions = np.concatenate([positions, permutation[:n - len(positions)]])
+        return self.df.iloc[positions]
@@ -0,0 +1,247 @@
+"""
+cache.py - In-memory and on-disk caches
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+CACHE_COLUMNS = ['text', 'sentiment', 'cleaned_text', 'word_count', 'char_count']
+
+
+def hash_file(path, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, read in fixed-size blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PreprocessedCache:
+    """Persist preprocessed reviews as an Arrow IPC (Feather) file keyed by content hash"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = Path(cache_path)
+
+    @staticmethod
+    def make_key(source_path: str, settings: dict) -> str:
+        """Build a cache key from the source file contents and preprocessing settings"""
+        digest = hashlib.sha256()
+        digest.update(hash_file(source_path).encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def load(self, key: str):
+        """
+        Load cached reviews if the cache matches `key`
+
+        The file is memory-mapped, so numeric columns are read without
+        copying. Returns None on a missing, stale or unreadable cache.
+        """
+        if not self.cache_path.exists():
+            return None
+
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(str(self.cache_path)))
+            metadata = reader.schema.metadata or {}
+            if metadata.get(b'cache_key') != key.encode():
+                return None
+            table = reader.read_all()
+        except (pa.ArrowInvalid, OSError):
+            return None
+
+        return table.to_pandas()
+
+    def save(self, df: pd.DataFrame, key: str):
+        """Write preprocessed reviews to the cache, replacing any previous file"""
+        table = pa.Table.from_pandas(df[CACHE_COLUMNS], preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'cache_key': key.encode()
+        })
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial cache
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+        feather.write_feather(table, str(tmp_path), compression='uncompressed')
+        os.replace(tmp_path, self.cache_path)
+
+    def clear(self):
+        """Remove the cache file"""
+        if self.cache_path.exists():
+            self.cache_path.unlink()
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe mapping that evicts the least recently used entry
+
+    Entries optionally expire `ttl` seconds after they were stored. Hit and
+    miss counts are kept for get_stats().
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key (marking it recently used), or default"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if self.ttl is not None and time.monotonic() >= self._expires[key]:
+                del self._data[key]
+                del self._expires[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+
+            if len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self._expires.pop(evicted, None)
+
+    def items(self) -> list:
+        """Entries from least to most recently used"""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Get hit/miss statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+class ImageCache:
+    """
+    Rendered images cached in memory and on disk
+
+    Images are keyed by a tuple of JSON-serializable parts (e.g. dataset
+    version, variant and size). Files on disk are also keyed by `version`,
+    which should change whenever the renderer's output does, so images from
+    older settings are never served. Each key is rendered at most once at a time,
+    so a request for an image that is already being rendered waits for it
+    instead of rendering it again. The oldest files beyond `max_files` are
+    removed from disk.
+    """
+
+    def __init__(self, cache_dir: str, maxsize: int = 16, max_files: int = 64, suffix: str = '.png',
+                 version: str = ''):
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+        self.suffix = suffix
+        self.version = version
+        self._memory = LRUCache(maxsize=maxsize)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: tuple) -> Path:
+        digest = hashlib.sha256(json.dumps([self.version, key]).encode()).hexdigest()
+        return self.cache_dir / (digest + self.suffix)
+
+    def get_or_render(self, key: tuple, render) -> bytes:
+        """Return the cached image for key, calling render() to produce it on a miss"""
+        image = self._memory.get(key)
+        if image is not None:
+            return image
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Rendered by another thread while this one waited
+            image = self._memory.get(key)
+            if image is not None:
+                return image
+
+            path = self._path(key)
+            try:
+                image = path.read_bytes()
+            except OSError:
+                image = render()
+                self._write(path, image)
+
+            self._memory.put(key, image)
+
+            # Later requests hit the memory cache, so the lock is no longer needed
+            with self._lock:
+                self._key_locks.pop(key, None)
+            return image
+
+    def _write(self, path: Path, image: bytes):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Other threads and processes may write the same directory, so each writer
+        # gets its own temporary file
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp')
+        tmp_path.write_bytes(image)
+        os.replace(tmp_path, path)
+
+        # Files removed by a concurrent writer while listing are skipped
+        files = []
+        for file in self.cache_dir.glob('*' + self.suffix):
+            try:
+                files.append((file.stat().st_mtime, file))
+            except FileNotFoundError:
+                continue
+
+        files.sort(key=lambda entry: entry[0])
+        for _, stale in files[:-self.max_files]:
+            stale.unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop cached images from memory and disk"""
+        self._memory.clear()
+        for path in self.cache_dir.glob('*' + self.suffix):
+            path.unlink(missing_ok=True)
@@ -1,8 +1,16 @@
 """
 data_loader.py - Module for loading and managing review data
 """
+import mmap
+import os
 import pandas as pd
 from pathlib import Path
+from .instrumentation import timed
+
+REQUIRED_COLUMNS = ['text', 'sentiment']
+SENTIMENT_LABELS = ['negative', 'neutral', 'positive']
+SENTIMENT_DTYPE = pd.CategoricalDtype(SENTIMENT_LABELS)
+DEFAULT_CHUNKSIZE = 50_000
 
 
 class DataLoader:
@@ -11,20 +19,138 @@ class DataLoader:
     def __init__(self, data_path: str = "data/reviews.csv"):
         self.data_path = Path(data_path)
 
-    def load_from_csv(self) -> pd.DataFrame:
-        """Load reviews from CSV file"""
+    def load_from_csv(self, chunksize: int = None, engine: str = None, errors: str = 'raise'):
+        """
+        Load reviews from CSV file
+
+        Args:
+            chunksize: If given, return an iterator of validated DataFrame
+                chunks of this many rows instead of a single DataFrame
+            engine: CSV parser for chunked mode ('c', 'python' or 'pyarrow')
+            errors: 'raise' or 'drop' rows with missing text or unknown labels
+                (chunked mode only)
+        """
         if not self.data_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
 
+        if chunksize is not None:
+            # Timed per chunk as it is read, under DataLoader.iter_csv_chunks
+            return self.iter_csv_chunks(chunksize=chunksize, engine=engine, errors=errors)
+
+        return self._read_csv()
+
+    @timed('DataLoader.load_from_csv')
+    def _read_csv(self) -> pd.DataFrame:
+        """Read and validate the whole CSV file at once"""
         df = pd.read_csv(self.data_path)
 
         # Validate required columns
-        required_cols = ['text', 'sentiment']
+        required_cols = REQUIRED_COLUMNS
         if not all(col in df.columns for col in required_cols):
             raise ValueError(f"CSV must contain columns: {required_cols}")
 
         return df
 
+    @timed()
+    def iter_csv_chunks(self, chunksize: int = DEFAULT_CHUNKSIZE, engine: str = None,
+                        errors: str = 'raise', require_sentiment: bool = True):
+        """
+        Stream reviews from CSV file in fixed-size chunks
+
+        Each chunk is validated on its own (required columns, missing values,
+        unknown sentiment labels) and its sentiment column is converted to a
+        categorical, so only one chunk is ever held in memory.
+
+        With require_sentiment=False only the text column is required and
+        checked, for unlabeled files that are going to be scored.
+
+        Yields:
+            DataFrame chunks with at most `chunksize` rows, indexed by their
+            row position in the file
+        """
+        if errors not in ('raise', 'drop'):
+            raise ValueError("errors must be 'raise' or 'drop'")
+
+        if engine == 'pyarrow':
+            chunks = self._iter_pyarrow_chunks(chunksize)
+        else:
+            chunks = pd.read_csv(
+                self.data_path,
+                chunksize=chunksize,
+                engine=engine,
+                dtype={col: str for col in REQUIRED_COLUMNS}
+            )
+
+        for chunk in chunks:
+            yield self._validate_chunk(chunk, errors, require_sentiment)
+
+    def _iter_pyarrow_chunks(self, chunksize: int):
+        """Read CSV with the pyarrow streaming reader, re-batched to `chunksize` rows"""
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+        except ImportError as e:
+            raise ImportError("engine='pyarrow' requires the pyarrow package") from e
+
+        reader = pa_csv.open_csv(
+            self.data_path,
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in REQUIRED_COLUMNS},
+                strings_can_be_null=True
+            )
+        )
+
+        pending = []
+        pending_rows = 0
+        start = 0
+
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                chunk = table.slice(0, chunksize).to_pandas()
+                chunk.index = pd.RangeIndex(start, start + chunksize)
+                yield chunk
+
+                start += chunksize
+                pending = table.slice(chunksize).to_batches()
+                pending_rows -= chunksize
+
+        if pending_rows:
+            chunk = pa.Table.from_batches(pending).to_pandas()
+            chunk.index = pd.RangeIndex(start, start + pending_rows)
+            yield chunk
+
+    @staticmethod
+    def _validate_chunk(chunk: pd.DataFrame, errors: str = 'raise',
+                        require_sentiment: bool = True) -> pd.DataFrame:
+        """Validate one chunk of reviews and declare the sentiment dtype"""
+        required_cols = REQUIRED_COLUMNS if require_sentiment else ['text']
+        if not all(col in chunk.columns for col in required_cols):
+            raise ValueError(f"CSV must contain columns: {required_cols}")
+
+        invalid = chunk['text'].isna()
+        if require_sentiment:
+            invalid |= ~chunk['sentiment'].isin(SENTIMENT_LABELS)
+
+        if invalid.any():
+            if errors == 'raise':
+                # Report file line numbers (header is line 1)
+                lines = (chunk.index[invalid][:5] + 2).tolist()
+                problem = (f"missing text or sentiment outside {SENTIMENT_LABELS}"
+                           if require_sentiment else "missing text")
+                raise ValueError(
+                    f"Found {int(invalid.sum())} rows with {problem} (first at lines {lines})"
+                )
+            chunk = chunk[~invalid].copy()
+
+        if require_sentiment:
+            chunk['sentiment'] = chunk['sentiment'].astype(SENTIMENT_DTYPE)
+        return chunk
+
+    @timed()
     def load_from_txt(self, txt_path: str) -> pd.DataFrame:
         """
         Load reviews from structured TXT file
@@ -36,32 +162,110 @@ class DataLoader:
         reviews = []
         sentiments = []
 
+        for sentiment, review in self.iter_txt_records(txt_path):
+            sentiments.append(sentiment)
+            reviews.append(review)
+
+        return pd.DataFrame({'text': reviews, 'sentiment': sentiments})
+
+    def iter_txt_records(self, txt_path: str, use_mmap: bool = False,
+                         require_sentiment: bool = True):
+        """
+        Stream (sentiment, review) records from a structured TXT file
+
+        The file is read line by line (or over a read-only memory map when
+        `use_mmap` is set), so memory use is bounded by the longest line
+        rather than the file size. With require_sentiment=False, entries
+        without a SENTIMENT: line are kept with a sentiment of None.
+        """
+        if use_mmap:
+            lines = self._iter_mmap_lines(txt_path)
+            yield from self._parse_txt_lines(lines, require_sentiment)
+            return
+
         with open(txt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            lines = (line[:-1] if line.endswith('\n') else line for line in f)
+            yield from self._parse_txt_lines(lines, require_sentiment)
 
-        # Split by separator
-        entries = content.split('---')
+    def iter_txt_batches(self, txt_path: str, batch_size: int = DEFAULT_CHUNKSIZE,
+                         use_mmap: bool = False, require_sentiment: bool = True):
+        """
+        Stream a structured TXT file as DataFrames of at most `batch_size` reviews
 
-        for entry in entries:
-            entry = entry.strip()
-            if not entry:
-                continue
+        Like CSV chunks, batches are indexed by the position of each review in the file.
+        """
+        reviews = []
+        sentiments = []
+        start = 0
 
-            lines = entry.split('\n')
-            sentiment = None
-            review = None
+        records = self.iter_txt_records(txt_path, use_mmap=use_mmap,
+                                        require_sentiment=require_sentiment)
+        for sentiment, review in records:
+            sentiments.append(sentiment)
+            reviews.append(review)
 
-            for line in lines:
-                if line.startswith('SENTIMENT:'):
-                    sentiment = line.replace('SENTIMENT:', '').strip().lower()
-                elif line.startswith('REVIEW:'):
-                    review = line.replace('REVIEW:', '').strip()
+            if len(reviews) >= batch_size:
+                yield pd.DataFrame({'text': reviews, 'sentiment': sentiments},
+                                   index=pd.RangeIndex(start, start + len(reviews)))
+                start += len(reviews)
+                reviews = []
+                sentiments = []
 
-            if sentiment and review:
-                sentiments.append(sentiment)
-                reviews.append(review)
+        if reviews:
+            yield pd.DataFrame({'text': reviews, 'sentiment': sentiments},
+                               index=pd.RangeIndex(start, start + len(reviews)))
 
-        return pd.DataFrame({'text': reviews, 'sentiment': sentiments})
+    @staticmethod
+    def _iter_mmap_lines(txt_path: str):
+        """Yield decoded lines of a file through a read-only memory map"""
+        with open(txt_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b''):
+                    if line.endswith(b'\r\n'):
+                        line = line[:-2]
+                    elif line.endswith(b'\n'):
+                        line = line[:-1]
+                    yield line.decode('utf-8')
+
+    @staticmethod
+    def _parse_txt_lines(lines, require_sentiment: bool = True):
+        """
+        Parse SENTIMENT:/REVIEW: records separated by '---'
+
+        Matches splitting the whole file on '---': a separator may appear
+        anywhere in a line, and only the first line of each entry has its
+        leading whitespace stripped.
+        """
+        sentiment = None
+        review = None
+        started = False
+
+        for line in lines:
+            for i, fragment in enumerate(line.split('---')):
+                if i > 0:
+                    # Separator reached: close the current entry
+                    if review and (sentiment or not require_sentiment):
+                        yield sentiment or None, review
+                    sentiment = None
+                    review = None
+                    started = False
+
+                if not started:
+                    fragment = fragment.lstrip()
+                    if not fragment:
+                        continue
+                    started = True
+
+                if fragment.startswith('SENTIMENT:'):
+                    sentiment = fragment.replace('SENTIMENT:', '').strip().lower()
+                elif fragment.startswith('REVIEW:'):
+                    review = fragment.replace('REVIEW:', '').strip()
+
+        if review and (sentiment or not require_sentiment):
+            yield sentiment or None, review
 
     def create_sample_csv(self, output_path: str = "data/reviews.csv"):
         """Create a sample CSV file with reviews"""
@@ -0,0 +1,236 @@
+"""
+inference.py - Low-latency single-review inference
+"""
+import json
+import math
+import os
+from pathlib import Path
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump whenever the compact file layout changes
+COMPACT_FORMAT_VERSION = 1
+
+# Vectorizer settings that determine how a text is split into n-grams
+ANALYZER_PARAMS = ['lowercase', 'strip_accents', 'token_pattern', 'ngram_range', 'stop_words']
+
+
+class CompiledPredictor:
+    """
+    Score one review against a fitted TF-IDF + linear model without sklearn
+
+    The n-gram lookup maps each vocabulary term straight to its column and
+    idf weight, so a review is scored in a single pass over its n-grams
+    followed by one dot product against the coefficients of the columns it
+    actually contains.
+    """
+
+    def __init__(self, analyzer, lookup, coef, intercept, classes,
+                 norm: str = 'l2', sublinear_tf: bool = False, link: str = 'softmax',
+                 coef_columns=None):
+        """
+        Args:
+            analyzer: Callable turning a text into n-grams (vectorizer.build_analyzer())
+            lookup: Mapping of n-gram -> (column, idf)
+            coef: Coefficient matrix, one row per class (one row for binary)
+            intercept: Intercept per coefficient row
+            classes: Class labels in probability order
+            norm: Row normalization of the vectorizer ('l2', 'l1' or None)
+            sublinear_tf: Whether term counts are replaced by 1 + log(count)
+            link: 'softmax' for multinomial models, 'ovr' for one-vs-rest
+            coef_columns: Column of coef for each lookup column, when coef
+                only holds some features (see load_compact); None if every
+                lookup column has its own coefficient column
+        """
+        self.analyzer = analyzer
+        self.lookup = lookup
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.link = link
+        self.coef_columns = None if coef_columns is None else np.asarray(coef_columns, dtype=np.intp)
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        """Class probabilities for one cleaned text"""
+        counts = {}
+        for gram in self.analyzer(text):
+            entry = self.lookup.get(gram)
+            if entry is not None:
+                counts[entry] = counts.get(entry, 0) + 1
+
+        scores = self.intercept
+        if counts:
+            n_terms = len(counts)
+            columns = np.fromiter((column for column, _ in counts), dtype=np.intp, count=n_terms)
+            weights = np.fromiter(
+                ((1 + math.log(count) if self.sublinear_tf else count) * idf
+                 for (_, idf), count in counts.items()),
+                dtype=np.float64,
+                count=n_terms
+            )
+
+            if self.norm == 'l2':
+                weights /= math.sqrt(weights @ weights)
+            elif self.norm == 'l1':
+                weights /= np.abs(weights).sum()
+
+            if self.coef_columns is not None:
+                columns = self.coef_columns[columns]
+            scores = scores + weights @ self.coef_t[columns]
+
+        return self._link(scores)
+
+    def _link(self, scores: np.ndarray) -> np.ndarray:
+        """Turn decision scores into probabilities the way the sklearn model does"""
+        if self.link == 'softmax' and len(scores) > 1:
+            exp = np.exp(scores - scores.max())
+            return exp / exp.sum()
+
+        prob = 1.0 / (1.0 + np.exp(-scores))
+        if len(scores) == 1:
+            return np.array([1.0 - prob[0], prob[0]])
+        return prob / prob.sum()
+
+    def predict(self, text: str) -> dict:
+        """Predict sentiment for one cleaned text, in the format of SentimentModel.predict"""
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+
+        return {
+            'prediction': self.classes[best],
+            'probabilities': {
+                self.classes[i]: float(probabilities[i])
+                for i in range(len(self.classes))
+            },
+            'confidence': float(probabilities[best])
+        }
+
+
+class SortedTermTable:
+    """
+    Read-only n-gram -> (column, idf) lookup over a sorted UTF-8 string table
+
+    Terms live in one bytes blob with an offsets array instead of one Python
+    string per term, and are found by binary search. Python's code point
+    order matches UTF-8 byte order, so the blob sorts like the vocabulary.
+    """
+
+    def __init__(self, blob: bytes, offsets: np.ndarray, idf: np.ndarray):
+        self._blob = blob
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.uint32))
+        self._idf = memoryview(np.ascontiguousarray(idf, dtype=np.float32))
+        self._size = len(idf)
+
+    def index(self, term: str) -> int:
+        """Position of term in the table, or -1"""
+        key = term.encode('utf-8')
+        blob = self._blob
+        offsets = self._offsets
+        lo, hi = 0, self._size
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if blob[offsets[mid]:offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self._size and blob[offsets[lo]:offsets[lo + 1]] == key:
+            return lo
+        return -1
+
+    def get(self, term: str, default=None):
+        """(column, idf) for term, or default"""
+        i = self.index(term)
+        if i < 0:
+            return default
+        return i, self._idf[i]
+
+    def __len__(self):
+        return self._size
+
+
+def save_compact(path: str, terms: list, idf: np.ndarray, columns: np.ndarray, coef: np.ndarray,
+                 intercept: np.ndarray, classes, analyzer_params: dict, norm: str,
+                 sublinear_tf: bool, link: str, coef_dtype='float16'):
+    """
+    Write a compact predictor file
+
+    Args:
+        terms: Sorted vocabulary terms
+        idf: idf weight per term
+        columns: Positions (in terms) of the features that keep coefficients
+        coef: Coefficients of those features, one row per class
+        intercept, classes, norm, sublinear_tf, link: as for CompiledPredictor
+        analyzer_params: Vectorizer settings listed in ANALYZER_PARAMS
+        coef_dtype: Storage type of the coefficients
+    """
+    encoded = [term.encode('utf-8') for term in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+
+    config = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'analyzer': analyzer_params,
+        'norm': norm,
+        'sublinear_tf': sublinear_tf,
+        'link': link
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial file
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            terms=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            offsets=offsets,
+            idf=np.asarray(idf, dtype=np.float32),
+            columns=np.asarray(columns, dtype=np.int32),
+            coef=np.asarray(coef, dtype=coef_dtype),
+            intercept=np.asarray(intercept, dtype=np.float64),
+            classes=np.asarray(classes, dtype=str),
+            config=np.array(json.dumps(config))
+        )
+    os.replace(tmp_path, path)
+
+
+def load_compact(path: str) -> CompiledPredictor:
+    """Load a file written by save_compact as a CompiledPredictor"""
+    with np.load(path, allow_pickle=False) as data:
+        config = json.loads(str(data['config']))
+        if config.get('format_version') != COMPACT_FORMAT_VERSION:
+            raise ValueError("Compact model file has an unsupported format version")
+
+        idf = data['idf']
+        lookup = SortedTermTable(data['terms'].tobytes(), data['offsets'], idf)
+
+        # Only kept features have coefficients; pruned terms point at an extra
+        # all-zero column, so they score nothing but still count towards the row norm
+        kept = data['coef']
+        coef = np.zeros((kept.shape[0], kept.shape[1] + 1), dtype=np.float32)
+        coef[:, :-1] = kept
+        coef_columns = np.full(len(idf), kept.shape[1], dtype=np.int32)
+        coef_columns[data['columns']] = np.arange(kept.shape[1], dtype=np.int32)
+
+        intercept = data['intercept']
+        classes = data['classes'].astype(object)
+
+    analyzer_params = config['analyzer']
+    analyzer_params['ngram_range'] = tuple(analyzer_params['ngram_range'])
+
+    return CompiledPredictor(
+        analyzer=TfidfVectorizer(**analyzer_params).build_analyzer(),
+        lookup=lookup,
+        coef=coef,
+        intercept=intercept,
+        classes=classes,
+        norm=config['norm'],
+        sublinear_tf=config['sublinear_tf'],
+        link=config['link'],
+        coef_columns=coef_columns
+    )
@@ -0,0 +1,252 @@
+"""
+instrumentation.py - Switchable timers, counters and memory sampling
+
+Timings are collected into a process-wide registry that is off by default.
+While it is off, an instrumented call costs one attribute check.
+
+    from src import instrumentation
+
+    @instrumentation.timed()
+    def load_from_csv(self): ...
+
+    with instrumentation.section('tab.overview'):
+        ...
+
+    instrumentation.configure(enabled=True, trace_memory=True)
+    instrumentation.registry.summary()
+"""
+import functools
+import inspect
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+
+# Most recent samples kept per timer for the percentiles
+DEFAULT_MAX_SAMPLES = 5000
+
+
+class Histogram:
+    """Running count, total and max plus a bounded window of recent samples"""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def summary(self) -> dict:
+        """count, total, mean, p50, p95 and max (percentiles over the recent window)"""
+        if not self.count:
+            return {'count': 0, 'total': 0.0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+        p50, p95 = np.percentile(np.fromiter(self.samples, dtype=np.float64), [50, 95])
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count,
+            'p50': float(p50),
+            'p95': float(p95),
+            'max': self.max
+        }
+
+
+class Registry:
+    """Thread-safe store of timer histograms and counters"""
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False,
+                 max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.enabled = enabled
+        self.trace_memory = False
+        self.max_samples = max_samples
+        self._timers = {}
+        self._memory = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.set_trace_memory(trace_memory)
+
+    def set_trace_memory(self, trace_memory: bool):
+        """Start or stop tracemalloc sampling of net allocations per timed call"""
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not trace_memory and self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = trace_memory
+
+    def record(self, name: str, seconds: float, allocated: int = None):
+        """Add one timing (and optionally a net allocation in bytes) to a timer"""
+        with self._lock:
+            histogram = self._timers.get(name)
+            if histogram is None:
+                histogram = self._timers[name] = Histogram(self.max_samples)
+            histogram.add(seconds)
+
+            if allocated is not None:
+                histogram = self._memory.get(name)
+                if histogram is None:
+                    histogram = self._memory[name] = Histogram(self.max_samples)
+                histogram.add(allocated / 2 ** 20)
+
+    def increment(self, name: str, n: int = 1):
+        """Add n to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def summary(self) -> dict:
+        """
+        Snapshot of everything collected so far
+
+        Returns:
+            dict with 'timers' (seconds) and 'memory' (net MB allocated per
+            call) histograms by name, 'counters', and the tracemalloc peak
+        """
+        with self._lock:
+            summary = {
+                'timers': {name: h.summary() for name, h in sorted(self._timers.items())},
+                'memory': {name: h.summary() for name, h in sorted(self._memory.items())},
+                'counters': dict(sorted(self._counters.items()))
+            }
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            summary['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        return summary
+
+    def top_allocations(self, limit: int = 10) -> list:
+        """Source lines holding the most traced memory right now (needs trace_memory)"""
+        if not tracemalloc.is_tracing():
+            return []
+
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+        return [
+            {'location': str(stat.traceback), 'size_mb': stat.size / 2 ** 20, 'count': stat.count}
+            for stat in stats
+        ]
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            **self.summary()
+        }, indent=2)
+
+    def dump(self, path: str):
+        """Write the summary as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json())
+
+    def reset(self):
+        """Drop all timers and counters"""
+        with self._lock:
+            self._timers.clear()
+            self._memory.clear()
+            self._counters.clear()
+
+
+registry = Registry()
+
+
+def configure(enabled: bool = True, trace_memory: bool = False, max_samples: int = None):
+    """Switch the process-wide registry on or off"""
+    registry.enabled = enabled
+    if max_samples is not None:
+        registry.max_samples = max_samples
+    registry.set_trace_memory(enabled and trace_memory)
+
+
+class Timer:
+    """Times one block of code into the registry; see section()"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = None
+        self._memory_start = None
+
+    def start(self):
+        if registry.enabled:
+            if registry.trace_memory:
+                self._memory_start = tracemalloc.get_traced_memory()[0]
+            self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._start is None:
+            return
+
+        seconds = time.perf_counter() - self._start
+        allocated = None
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0] - self._memory_start
+
+        registry.record(self.name, seconds, allocated)
+        self._start = None
+        self._memory_start = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def section(name: str) -> Timer:
+    """
+    Time a block of code under `name`, as a context manager or with start()/stop()
+
+        timer = section('app.rerun').start()
+        ...
+        timer.stop()
+    """
+    return Timer(name)
+
+
+def timed(name: str = None):
+    """
+    Decorator timing every call of a function under `name` (default: its qualified name)
+
+    Generator functions are timed once per item they yield, counting only the
+    time spent producing it, not the time the caller holds it.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        timer = Timer(label).start()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        timer.stop()
+                        yield item
+                finally:
+                    iterator.close()
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            with Timer(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,19 +1,185 @@
 """
 model.py - Module for sentiment analysis model with overfitting detection
 """
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+import hashlib
+import itertools
+import math
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+import joblib
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.model_selection import train_test_split, StratifiedKFold
+from sklearn.feature_extraction.text import (
+    TfidfVectorizer, HashingVectorizer, CountVectorizer, TfidfTransformer
+)
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import numpy as np
+import pandas as pd
+from scipy import sparse
+from .data_loader import SENTIMENT_LABELS
+from .inference import CompiledPredictor, ANALYZER_PARAMS, save_compact
+from .cache import LRUCache
+from .instrumentation import registry, timed
+
+# Bump whenever the saved artifact layout changes
+ARTIFACT_VERSION = 2
+
+# Fewest training rows per class and fold in a successive-halving round
+MIN_ROWS_PER_CLASS = 5
+
+
+def _row_hashes(X, y) -> bytes:
+    """Per-row hashes of texts and labels"""
+    frame = pd.DataFrame({'text': pd.Series(X).to_numpy(), 'label': pd.Series(y).to_numpy()})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()
+
+
+def hash_training_data(X, y) -> str:
+    """Fingerprint training texts and labels, used to version saved models"""
+    return hashlib.sha256(_row_hashes(X, y)).hexdigest()
+
+
+def _count_fold(X_train, X_test, vectorizer_params: dict):
+    """
+    Tokenize and count one cross-validation fold, fitting the vocabulary on its training part
+
+    Returns train and test count matrices, the n-gram order of each column
+    and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    vectorizer = CountVectorizer(**vectorizer_params)
+    train_counts = vectorizer.fit_transform(X_train)
+    test_counts = vectorizer.transform(X_test)
+    ngram_orders = np.char.count(vectorizer.get_feature_names_out().astype(str), ' ') + 1
+    return train_counts, test_counts, ngram_orders, time.perf_counter() - start
+
+
+def _fit_fold(train_counts, test_counts, y_train, y_test, classifier_params: dict):
+    """Fit IDF weighting and the classifier on one fold's counts, return (accuracy, seconds)"""
+    start = time.perf_counter()
+    pipeline = Pipeline([
+        ('tfidf', TfidfTransformer()),
+        ('classifier', LogisticRegression(**classifier_params))
+    ])
+    pipeline.fit(train_counts, y_train)
+    score = accuracy_score(y_test, pipeline.predict(test_counts))
+    return score, time.perf_counter() - start
+
+
+def _select_columns(train_counts, ngram_orders, ngram_range: tuple, max_features: int):
+    """
+    Columns a CountVectorizer with these settings would keep
+
+    Restricts shared counts to the n-gram orders in ngram_range, then keeps
+    the max_features most frequent terms the way CountVectorizer does.
+    """
+    term_freqs = np.asarray(train_counts.sum(axis=0)).ravel()
+    mask = (ngram_orders >= ngram_range[0]) & (ngram_orders <= ngram_range[1]) & (term_freqs > 0)
+    columns = np.flatnonzero(mask)
+
+    if max_features is not None and len(columns) > max_features:
+        # Same (unstable) sort as CountVectorizer, so ties resolve identically
+        top = (-term_freqs[columns]).argsort()[:max_features]
+        columns = np.sort(columns[top])
+
+    return columns
+
+
+def _evaluate_candidate(train_counts, test_counts, y_train, y_test, ngram_orders,
+                        params: dict, classifier_params: dict) -> dict:
+    """Fit and score one hyperparameter candidate on one fold's (subsampled) counts"""
+    columns = _select_columns(train_counts, ngram_orders, params['ngram_range'], params['max_features'])
+    train_features = train_counts[:, columns]
+    test_features = test_counts[:, columns]
+
+    start = time.perf_counter()
+    pipeline = Pipeline([
+        ('tfidf', TfidfTransformer()),
+        ('classifier', LogisticRegression(**{**classifier_params, 'C': params['C']}))
+    ])
+    pipeline.fit(train_features, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = pipeline.predict(test_features)
+    predict_time = time.perf_counter() - start
+
+    return {
+        'test_accuracy': accuracy_score(y_test, y_pred),
+        'train_accuracy': accuracy_score(y_train, pipeline.predict(train_features)),
+        'fit_time': fit_time,
+        'predict_latency_ms': 1000 * predict_time / len(y_test)
+    }
+
+
+def _sparse_nbytes(matrix) -> int:
+    """Bytes held by a scipy sparse matrix (0 for None)"""
+    if matrix is None:
+        return 0
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def _array_nbytes(values) -> int:
+    """Approximate bytes held by a label array or Series, including string objects"""
+    if values is None:
+        return 0
+    if isinstance(values, (pd.Series, pd.Categorical)):
+        return int(pd.Series(values).memory_usage(deep=True, index=False))
+    values = np.asarray(values)
+    if values.dtype == object:
+        return values.nbytes + sum(sys.getsizeof(value) for value in values)
+    return values.nbytes
+
+
+def _process_rss() -> int:
+    """Current resident set size of this process in bytes (peak RSS if unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return 0
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
 
 
 class SentimentModel:
     """Handle model training and prediction with overfitting detection"""
 
-    def __init__(self, test_size: float = 0.2, random_state: int = 42):
+    def __init__(self, test_size: float = 0.2, random_state: int = 42,
+                 max_features: int = 5000, ngram_range: tuple = (1, 2), C: float = 1.0,
+                 prediction_cache_size: int = 1024, prediction_cache_ttl: float = None,
+                 lean: bool = False, spill_dir: str = None, cv_cache_size: int = 4):
+        """
+        Args:
+            lean: Use float32 features, release the train/test matrices and
+                per-row test labels after training, and don't keep
+                cross-validation counts between calls
+            spill_dir: In lean mode, write the released matrices here instead
+                of discarding them (see load_training_matrices)
+            cv_cache_size: Data and settings combinations whose per-fold
+                count matrices are kept by cross_validate and tune_hyperparameters
+        """
         self.test_size = test_size
         self.random_state = random_state
+        self.max_features = max_features
+        self.ngram_range = tuple(ngram_range)
+        self.C = C
+        self.lean = lean
+        self.spill_dir = Path(spill_dir) if spill_dir else None
         self.vectorizer = None
         self.model = None
         self.metrics = {}
@@ -21,9 +187,127 @@ class SentimentModel:
         self.X_test_tfidf = None
         self.y_train = None
         self.y_test = None
+        self.data_hash = None
+        self._predictor = None
+
+        # Feature names and coefficient ranking, computed on first use
+        self._feature_names = None
+        self._coef_order = None
+
+        # Single-text predictions keyed by (model_version, cleaned text)
+        self.prediction_cache = LRUCache(maxsize=prediction_cache_size, ttl=prediction_cache_ttl)
+        self.model_version = None
+
+        # Per-fold count matrices from cross_validate, keyed by data and settings
+        self._cv_cache = LRUCache(maxsize=cv_cache_size)
+
+    def _vectorizer_params(self) -> dict:
+        """Settings shared by the TF-IDF vectorizer and cross-validation counts"""
+        return {'max_features': self.max_features, 'ngram_range': self.ngram_range}
+
+    def _release_training_state(self):
+        """In lean mode, drop (or spill to disk) everything only needed during training"""
+        if not self.lean:
+            return
+
+        if self.spill_dir is not None and self.X_train_tfidf is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            sparse.save_npz(self.spill_dir / 'X_train_tfidf.npz', self.X_train_tfidf)
+            sparse.save_npz(self.spill_dir / 'X_test_tfidf.npz', self.X_test_tfidf)
+            np.save(self.spill_dir / 'y_train.npy', np.asarray(self.y_train, dtype=str))
+            np.save(self.spill_dir / 'y_test.npy', np.asarray(self.y_test, dtype=str))
+
+        self.X_train_tfidf = None
+        self.X_test_tfidf = None
+        self.y_train = None
+        self.y_test = None
+        self.metrics.pop('y_test', None)
+        self.metrics.pop('y_pred', None)
+        self._cv_cache.clear()
+
+    def load_training_matrices(self) -> dict:
+        """
+        Get the train/test TF-IDF matrices and labels from the last train()
+
+        Reads them back from spill_dir when lean mode released them.
+        """
+        if self.X_train_tfidf is not None:
+            return {
+                'X_train_tfidf': self.X_train_tfidf,
+                'X_test_tfidf': self.X_test_tfidf,
+                'y_train': self.y_train,
+                'y_test': self.y_test
+            }
+
+        if self.spill_dir is None or not (self.spill_dir / 'X_train_tfidf.npz').exists():
+            raise ValueError("Training matrices were released and not spilled to disk")
+
+        return {
+            'X_train_tfidf': sparse.load_npz(self.spill_dir / 'X_train_tfidf.npz'),
+            'X_test_tfidf': sparse.load_npz(self.spill_dir / 'X_test_tfidf.npz'),
+            'y_train': np.load(self.spill_dir / 'y_train.npy'),
+            'y_test': np.load(self.spill_dir / 'y_test.npy')
+        }
+
+    def memory_footprint(self) -> dict:
+        """
+        Estimate the bytes held by each part of the model
+
+        Returns:
+            dict of byte counts per component, their 'total', and the
+            resident set size of the whole process ('process_rss')
+        """
+        footprint = {
+            'vocabulary': 0,
+            'idf': 0,
+            'coefficients': 0,
+            'training_matrices': 0,
+            'test_labels': 0,
+            'cv_cache': 0
+        }
+
+        vocabulary = getattr(self.vectorizer, 'vocabulary_', None)
+        if vocabulary is not None:
+            footprint['vocabulary'] = sys.getsizeof(vocabulary) + sum(
+                sys.getsizeof(term) + sys.getsizeof(column) for term, column in vocabulary.items())
+        if self.vectorizer is not None and hasattr(self.vectorizer, 'idf_'):
+            footprint['idf'] = self.vectorizer.idf_.nbytes
+        if self.model is not None and hasattr(self.model, 'coef_'):
+            footprint['coefficients'] = self.model.coef_.nbytes + self.model.intercept_.nbytes
+
+        footprint['training_matrices'] = sum(
+            _sparse_nbytes(matrix) for matrix in (self.X_train_tfidf, self.X_test_tfidf))
+        footprint['test_labels'] = sum(
+            _array_nbytes(labels)
+            for labels in (self.y_train, self.y_test, self.metrics.get('y_test'), self.metrics.get('y_pred')))
+        footprint['cv_cache'] = sum(
+            _sparse_nbytes(train_counts) + _sparse_nbytes(test_counts)
+            + _array_nbytes(y_train) + _array_nbytes(y_test) + _array_nbytes(ngram_orders)
+            for _, folds in self._cv_cache.items()
+            for train_counts, test_counts, y_train, y_test, ngram_orders, _ in folds)
+
+        footprint['total'] = sum(footprint.values())
+        footprint['process_rss'] = _process_rss()
+        return footprint
 
+    def _classifier_params(self) -> dict:
+        """Settings of the logistic regression classifier"""
+        return {'C': self.C, 'max_iter': 1000, 'class_weight': 'balanced'}
+
+    def _reset_inference_state(self):
+        """Invalidate compiled and cached predictions after the model changed"""
+        self._predictor = None
+        self._feature_names = None
+        self._coef_order = None
+        self.model_version = uuid.uuid4().hex
+        self.prediction_cache.clear()
+
+    @timed()
     def train(self, X, y):
         """Train the sentiment analysis model"""
+        self.data_hash = hash_training_data(X, y)
+        self._reset_inference_state()
+
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y,
@@ -38,8 +322,8 @@ class SentimentModel:
 
         # Initialize vectorizer
         self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2)
+            **self._vectorizer_params(),
+            dtype=np.float32 if self.lean else np.float64
         )
 
         # Transform text to TF-IDF features
@@ -47,10 +331,7 @@ class SentimentModel:
         self.X_test_tfidf = self.vectorizer.transform(X_test)
 
         # Train model
-        self.model = LogisticRegression(
-            max_iter=1000,
-            class_weight='balanced'
-        )
+        self.model = LogisticRegression(**self._classifier_params())
         self.model.fit(self.X_train_tfidf, y_train)
 
         # Make predictions
@@ -71,13 +352,160 @@ class SentimentModel:
             'y_pred': y_pred_test
         }
 
+        self._release_training_state()
+        return self.metrics
+
+    @timed()
+    def train_streaming(self, chunks, holdout=None, text_column: str = 'cleaned_text',
+                        label_column: str = 'sentiment', classes=SENTIMENT_LABELS,
+                        n_features: int = 2 ** 18) -> dict:
+        """
+        Train out of core on a stream of DataFrame chunks
+
+        Texts are featurized with a stateless HashingVectorizer and learned
+        incrementally by an SGD logistic regression through partial_fit, so
+        memory is bounded by one chunk whatever the corpus size. Chunks must
+        already be preprocessed, e.g.
+
+            chunks = (preprocessor.preprocess_dataframe(chunk)
+                      for chunk in loader.load_from_csv(chunksize=50000))
+
+        Args:
+            chunks: Iterable of DataFrames with text and label columns
+            holdout: Optional iterable of held-out chunks, scored after
+                training. Without it, `test_size` of every chunk is held out
+                and scored before that chunk is learned (rows held out before
+                the first fit are scored right after it).
+            text_column: Column with cleaned text
+            label_column: Column with sentiment labels
+            classes: All labels that can occur in the stream
+            n_features: Number of hashed feature columns
+
+        Returns:
+            metrics dict with the same keys as train(). train_accuracy is
+            measured on each training chunk right after it is learned.
+        """
+        classes = np.asarray(classes, dtype=object)
+        rng = np.random.default_rng(self.random_state)
+        digest = hashlib.sha256()
+        self._reset_inference_state()
+
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            alternate_sign=False
+        )
+        self.model = SGDClassifier(
+            loss='log_loss',
+            random_state=self.random_state
+        )
+        self.X_train_tfidf = None
+        self.X_test_tfidf = None
+        self.y_train = None
+        self.y_test = None
+
+        train_correct = 0
+        train_total = 0
+        y_true = []
+        y_pred = []
+
+        # Held-out chunks not scored yet: scored before the next chunk is
+        # learned, once the classifier has been fitted
+        pending = []
+
+        for chunk in chunks:
+            if holdout is None:
+                held_out = rng.random(len(chunk)) < self.test_size
+                if held_out.any():
+                    pending.append(chunk[held_out])
+                chunk = chunk[~held_out]
+
+            if self._is_fitted():
+                for test_chunk in pending:
+                    y_true.append(test_chunk[label_column].to_numpy())
+                    y_pred.append(self.model.predict(self.vectorizer.transform(test_chunk[text_column])))
+                pending = []
+
+            if len(chunk) == 0:
+                continue
+
+            texts = chunk[text_column]
+            labels = chunk[label_column].to_numpy()
+            digest.update(_row_hashes(texts, labels))
+
+            features = self.vectorizer.transform(texts)
+            self.model.partial_fit(features, labels, classes=classes)
+
+            train_correct += int((self.model.predict(features) == labels).sum())
+            train_total += len(labels)
+
+        if train_total == 0:
+            raise ValueError("No training rows in stream")
+
+        # Held-out rows of the last chunk (and any before it), or the separate holdout
+        for test_chunk in (pending if holdout is None else holdout):
+            y_true.append(test_chunk[label_column].to_numpy())
+            y_pred.append(self.model.predict(self.vectorizer.transform(test_chunk[text_column])))
+
+        if not y_true:
+            raise ValueError("No held-out rows to compute metrics on")
+
+        self.data_hash = digest.hexdigest()
+
+        # Categoricals keep one byte per held-out row instead of an object per label
+        y_test = pd.Categorical(np.concatenate(y_true), categories=classes)
+        y_pred_test = pd.Categorical(np.concatenate(y_pred), categories=classes)
+
+        train_accuracy = train_correct / train_total
+        test_accuracy = accuracy_score(y_test, y_pred_test)
+
+        self.metrics = {
+            'train_accuracy': train_accuracy,
+            'accuracy': test_accuracy,
+            'accuracy_gap': train_accuracy - test_accuracy,
+            'classification_report': classification_report(
+                y_test, y_pred_test, labels=classes, output_dict=True, zero_division=0),
+            'confusion_matrix': confusion_matrix(y_test, y_pred_test, labels=classes),
+            'y_test': y_test,
+            'y_pred': y_pred_test
+        }
+
+        self._release_training_state()
         return self.metrics
 
+    def _is_fitted(self) -> bool:
+        """Whether the classifier has been fitted at least once"""
+        return self.model is not None and hasattr(self.model, 'classes_')
+
+    @timed()
     def predict(self, text: str) -> dict:
         """Predict sentiment for a single text"""
         if self.model is None or self.vectorizer is None:
             raise ValueError("Model not trained. Call train() first.")
 
+        return self._cached_predict(text, self._predict_sklearn)
+
+    def _cached_predict(self, text: str, predict_func) -> dict:
+        """Serve a prediction from the prediction cache, computing it on a miss"""
+        key = (self.model_version, text)
+        result = self.prediction_cache.get(key)
+
+        if result is None:
+            registry.increment('SentimentModel.prediction_cache.miss')
+            result = predict_func(text)
+            self.prediction_cache.put(key, result)
+        else:
+            registry.increment('SentimentModel.prediction_cache.hit')
+
+        # Callers get their own copy so cached entries cannot be modified
+        return {**result, 'probabilities': dict(result['probabilities'])}
+
+    def get_prediction_cache_stats(self) -> dict:
+        """Get hit/miss statistics of the prediction cache"""
+        return self.prediction_cache.get_stats()
+
+    def _predict_sklearn(self, text: str) -> dict:
+        """Predict sentiment for a single text through the sklearn vectorizer and model"""
         # Transform text
         text_tfidf = self.vectorizer.transform([text])
 
@@ -97,6 +525,255 @@ class SentimentModel:
             'confidence': float(max(probabilities))
         }
 
+    @timed()
+    def compile(self) -> CompiledPredictor:
+        """
+        Build a low-latency predictor for single reviews
+
+        The predictor gives the same probabilities as predict() (to float
+        tolerance) without the sklearn transform/predict call overhead.
+        Only TF-IDF models can be compiled, not hashed-feature ones.
+        """
+        if self.model is None or self.vectorizer is None:
+            raise ValueError("Model not trained. Call train() first.")
+        if not hasattr(self.vectorizer, 'vocabulary_'):
+            raise ValueError("Only TF-IDF models can be compiled")
+
+        params = self.vectorizer.get_params()
+        if params['use_idf']:
+            idf = self.vectorizer.idf_
+        else:
+            idf = np.ones(len(self.vectorizer.vocabulary_))
+
+        lookup = {
+            term: (int(column), float(idf[column]))
+            for term, column in self.vectorizer.vocabulary_.items()
+        }
+
+        return CompiledPredictor(
+            analyzer=self.vectorizer.build_analyzer(),
+            lookup=lookup,
+            coef=self.model.coef_,
+            intercept=self.model.intercept_,
+            classes=self.model.classes_,
+            norm=params['norm'],
+            sublinear_tf=params['sublinear_tf'],
+            link=self._link_function()
+        )
+
+    def _link_function(self) -> str:
+        """How decision scores become probabilities: 'softmax' or 'ovr'"""
+        # Multiclass LogisticRegression is multinomial unless configured one-vs-rest
+        multinomial = (
+            isinstance(self.model, LogisticRegression)
+            and getattr(self.model, 'multi_class', 'auto') != 'ovr'
+            and self.model.solver != 'liblinear'
+        )
+        return 'softmax' if multinomial else 'ovr'
+
+    @timed()
+    def export_compact(self, path: str, threshold: float = 0.05, coef_dtype: str = 'float16',
+                       prune_terms: bool = False) -> dict:
+        """
+        Export a small, fast-loading predictor file
+
+        Features whose largest absolute coefficient is below `threshold`
+        times the largest absolute coefficient of the model are pruned
+        (threshold=0 keeps every feature), the vocabulary is stored as a
+        sorted string table, and coefficients are stored as `coef_dtype`.
+        Load it with inference.load_compact().
+
+        Pruned terms stay in the table by default so they still count
+        towards each review's TF-IDF norm, which keeps probabilities close to
+        predict(). With prune_terms=True they are dropped entirely for an
+        even smaller file at some cost in fidelity.
+
+        Returns:
+            dict with the number of terms in the file, features kept out of
+            the model's total, and the file size
+        """
+        if self.model is None or self.vectorizer is None:
+            raise ValueError("Model not trained. Call train() first.")
+        if not hasattr(self.vectorizer, 'vocabulary_'):
+            raise ValueError("Only TF-IDF models can be exported")
+
+        params = self.vectorizer.get_params()
+        if params['analyzer'] != 'word' or params['preprocessor'] or params['tokenizer']:
+            raise ValueError("Only the default word analyzer can be exported")
+
+        terms = self.vectorizer.get_feature_names_out().tolist()
+        idf = self.vectorizer.idf_ if params['use_idf'] else np.ones(len(terms))
+        coef = np.asarray(self.model.coef_)
+        weight = np.abs(coef).max(axis=0)
+        keep = np.flatnonzero(weight >= threshold * weight.max())
+
+        if prune_terms:
+            terms = [terms[i] for i in keep]
+            idf = idf[keep]
+            columns = np.arange(len(keep))
+        else:
+            columns = keep
+
+        save_compact(
+            path,
+            terms=terms,
+            idf=idf,
+            columns=columns,
+            coef=coef[:, keep],
+            intercept=self.model.intercept_,
+            classes=self.model.classes_,
+            analyzer_params={name: params[name] for name in ANALYZER_PARAMS},
+            norm=params['norm'],
+            sublinear_tf=params['sublinear_tf'],
+            link=self._link_function(),
+            coef_dtype=coef_dtype
+        )
+
+        return {
+            'n_terms': len(terms),
+            'n_features_kept': len(keep),
+            'n_features_total': coef.shape[1],
+            'file_bytes': Path(path).stat().st_size
+        }
+
+    @timed()
+    def predict_fast(self, text: str) -> dict:
+        """Predict sentiment for a single text through the compiled predictor"""
+        if self._predictor is None:
+            self._predictor = self.compile()
+        return self._cached_predict(text, self._predictor.predict)
+
+    @timed()
+    def predict_batch(self, texts, chunk_size: int = None, as_frame: bool = False):
+        """
+        Predict sentiment for many texts in one vectorized pass
+
+        Args:
+            texts: Sequence of cleaned texts
+            chunk_size: If given, transform and score this many texts at a
+                time to bound the size of the sparse matrix
+            as_frame: Return a DataFrame with prediction, confidence and one
+                prob_<class> column per class instead of a dict of arrays
+
+        Returns:
+            dict with 'predictions' (labels), 'probabilities' (one row per
+            text, columns in 'classes' order), 'confidence' and 'classes'
+        """
+        if self.model is None or self.vectorizer is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        classes = self.model.classes_
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = list(texts)
+        registry.increment('SentimentModel.predict_batch.rows', len(texts))
+
+        if not texts:
+            probabilities = np.empty((0, len(classes)))
+        elif chunk_size is None:
+            probabilities = self.model.predict_proba(self.vectorizer.transform(texts))
+        else:
+            probabilities = np.vstack([
+                self.model.predict_proba(self.vectorizer.transform(texts[i:i + chunk_size]))
+                for i in range(0, len(texts), chunk_size)
+            ])
+
+        predictions = classes[probabilities.argmax(axis=1)]
+        confidence = probabilities.max(axis=1, initial=0.0)
+
+        if as_frame:
+            frame = pd.DataFrame({'prediction': predictions, 'confidence': confidence}, index=index)
+            for i, label in enumerate(classes):
+                frame[f'prob_{label}'] = probabilities[:, i]
+            return frame
+
+        return {
+            'predictions': predictions,
+            'probabilities': probabilities,
+            'confidence': confidence,
+            'classes': classes
+        }
+
+    @timed()
+    def save(self, path: str):
+        """
+        Save the trained model as a versioned artifact
+
+        Arrays (idf vector, coefficients) are stored uncompressed so load()
+        can memory-map them.
+        """
+        if self.model is None or self.vectorizer is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        artifact = {
+            'artifact_version': ARTIFACT_VERSION,
+            'sklearn_version': sklearn.__version__,
+            'data_hash': self.data_hash,
+            'test_size': self.test_size,
+            'random_state': self.random_state,
+            'max_features': self.max_features,
+            'ngram_range': self.ngram_range,
+            'C': self.C,
+            'vectorizer': self.vectorizer,
+            'model': self.model,
+            'metrics': self.metrics
+        }
+
+        # Write to a temporary file first so readers never see a partial artifact
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    @timed()
+    def load(cls, path: str, data_hash: str = None, **kwargs) -> 'SentimentModel':
+        """
+        Load a model saved with save()
+
+        Args:
+            path: Artifact path
+            data_hash: If given, the artifact must have been trained on data
+                with this hash (see hash_training_data)
+            **kwargs: Other SentimentModel constructor arguments, such as
+                prediction cache settings
+
+        Raises:
+            FileNotFoundError: if the artifact does not exist
+            ValueError: if the artifact is from another version or other data
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Model artifact not found: {path}")
+
+        artifact = joblib.load(path, mmap_mode='r')
+
+        if artifact.get('artifact_version') != ARTIFACT_VERSION:
+            raise ValueError("Model artifact has an unsupported format version")
+        if artifact.get('sklearn_version') != sklearn.__version__:
+            raise ValueError(
+                f"Model artifact was saved with scikit-learn {artifact.get('sklearn_version')}, "
+                f"running {sklearn.__version__}"
+            )
+        if data_hash is not None and artifact['data_hash'] != data_hash:
+            raise ValueError("Model artifact was trained on different data")
+
+        model = cls(
+            test_size=artifact['test_size'],
+            random_state=artifact['random_state'],
+            max_features=artifact['max_features'],
+            ngram_range=artifact['ngram_range'],
+            C=artifact['C'],
+            **kwargs
+        )
+        model.vectorizer = artifact['vectorizer']
+        model.model = artifact['model']
+        model.metrics = dict(artifact['metrics'])
+        model.data_hash = artifact['data_hash']
+        model._reset_inference_state()
+        model._release_training_state()
+        return model
+
     def diagnose_overfitting(self) -> dict:
         """
         Diagnose if the model is overfitting or underfitting
@@ -155,26 +832,39 @@ class SentimentModel:
             'recommendation': recommendation
         }
 
-    def cross_validate(self, X, y, cv: int = 5) -> dict:
+    @timed()
+    def cross_validate(self, X, y, cv: int = 5, n_jobs: int = -1) -> dict:
         """
         Perform cross-validation to get more reliable performance estimates
 
+        Every fold fits its own vocabulary, IDF weights and classifier on its
+        training part only, so no statistics leak from the held-out part.
+        Folds run in parallel. Per-fold count matrices are cached (up to
+        cv_cache_size settings, and not in lean mode), so running again on the
+        same data and vectorizer settings only refits the IDF weights and the
+        classifier.
+
         Args:
-            X: Features
+            X: Cleaned texts
             y: Labels
-            cv: Number of cross-validation folds
+            cv: Number of stratified cross-validation folds
+            n_jobs: Folds to run in parallel (-1 for all cores)
 
         Returns:
-            dict with cross-validation scores
+            dict with cross-validation scores and per-fold wall times
         """
-        if self.model is None or self.vectorizer is None:
-            raise ValueError("Model not trained. Call train() first.")
+        folds, counts_cached = self._get_fold_counts(X, y, cv, self._vectorizer_params(), n_jobs)
 
-        # Transform all data
-        X_tfidf = self.vectorizer.transform(X)
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_fold)(train_counts, test_counts, y_train, y_test, self._classifier_params())
+            for train_counts, test_counts, y_train, y_test, _, _ in folds
+        )
 
-        # Perform cross-validation
-        cv_scores = cross_val_score(self.model, X_tfidf, y, cv=cv, scoring='accuracy')
+        cv_scores = np.array([score for score, _ in results])
+        fold_times = np.array([
+            fit_time + (0.0 if counts_cached else count_time)
+            for (_, fit_time), (*_, count_time) in zip(results, folds)
+        ])
 
         return {
             'cv_scores': cv_scores,
@@ -182,9 +872,151 @@ class SentimentModel:
             'std_cv_score': cv_scores.std(),
             'min_cv_score': cv_scores.min(),
             'max_cv_score': cv_scores.max(),
+            'fold_times': fold_times,
+            'counts_cached': counts_cached,
             'interpretation': self._interpret_cv_scores(cv_scores)
         }
 
+    def _get_fold_counts(self, X, y, cv: int, vectorizer_params: dict, n_jobs: int):
+        """
+        Count matrices for each stratified fold, computed once per data and settings
+
+        Returns a list of (train_counts, test_counts, y_train, y_test,
+        ngram_orders, count_seconds) per fold, and whether it came from cache.
+        """
+        X = pd.Series(X).to_numpy(dtype=object)
+        y = pd.Series(y).to_numpy()
+
+        cache_key = (hash_training_data(X, y), cv, tuple(sorted(vectorizer_params.items())))
+        folds = self._cv_cache.get(cache_key)
+        if folds is not None:
+            return folds, True
+
+        splits = list(StratifiedKFold(n_splits=cv).split(X, y))
+        counted = Parallel(n_jobs=n_jobs)(
+            delayed(_count_fold)(X[train_idx], X[test_idx], vectorizer_params)
+            for train_idx, test_idx in splits
+        )
+        folds = [
+            (train_counts, test_counts, y[train_idx], y[test_idx], ngram_orders, count_time)
+            for (train_idx, test_idx), (train_counts, test_counts, ngram_orders, count_time)
+            in zip(splits, counted)
+        ]
+        if not self.lean:
+            self._cv_cache.put(cache_key, folds)
+        return folds, False
+
+    def clear_cv_cache(self):
+        """Drop cached cross-validation count matrices"""
+        self._cv_cache.clear()
+
+    @timed()
+    def tune_hyperparameters(self, X, y, param_grid: dict = None, cv: int = 3,
+                             factor: int = 3, n_jobs: int = -1) -> pd.DataFrame:
+        """
+        Search C, max_features and ngram_range by successive halving
+
+        All candidates share one tokenization per fold: texts are counted
+        once with the widest n-gram range and no feature limit, and each
+        candidate selects its columns from those counts. Every round scores
+        the surviving candidates on a larger sample of each training fold
+        (the last round uses all of it) and keeps the best 1/factor of them.
+        Candidates within a round run in parallel. Rows are sampled with
+        stratification, and the number of rounds is capped so the first one
+        still has MIN_ROWS_PER_CLASS rows per class and fold.
+
+        Args:
+            X: Cleaned texts
+            y: Labels
+            param_grid: dict of lists for 'C', 'max_features' and
+                'ngram_range' (defaults around the current settings, as
+                suggested by diagnose_overfitting)
+            cv: Number of stratified folds
+            factor: Fraction of candidates dropped per round is 1 - 1/factor (at least 2)
+            n_jobs: Candidate fits to run in parallel (-1 for all cores)
+
+        Returns:
+            DataFrame ranked by rounds survived then test accuracy, with
+            train/test gap, mean fit time and per-review predict latency
+            (IDF weighting and classifier only, from pre-counted features)
+        """
+        if factor < 2:
+            raise ValueError("factor must be at least 2")
+
+        param_grid = {
+            'C': [0.1, 1.0, 10.0],
+            'max_features': [2000, 5000, 10000],
+            'ngram_range': [(1, 1), (1, 2), (1, 3)],
+            **(param_grid or {})
+        }
+        candidates = [
+            {'C': C, 'max_features': max_features, 'ngram_range': tuple(ngram_range)}
+            for C, max_features, ngram_range in itertools.product(
+                param_grid['C'], param_grid['max_features'], param_grid['ngram_range'])
+        ]
+
+        max_order = max(params['ngram_range'][1] for params in candidates)
+        folds, _ = self._get_fold_counts(
+            X, y, cv, {'max_features': None, 'ngram_range': (1, max_order)}, n_jobs)
+
+        n_rounds = 1
+        while factor ** n_rounds <= len(candidates):
+            n_rounds += 1
+
+        # Stop adding rounds once the first one would sample fewer rows than a
+        # few per class and fold, so early eliminations aren't decided by noise
+        max_train_rows = min(len(fold[2]) for fold in folds)
+        n_classes = len(np.unique(y))
+        min_resources = min(n_classes * MIN_ROWS_PER_CLASS, max_train_rows)
+        while n_rounds > 1 and max_train_rows * factor ** (1 - n_rounds) < min_resources:
+            n_rounds -= 1
+
+        rng = np.random.default_rng(self.random_state)
+        classifier_params = self._classifier_params()
+        survivors = list(range(len(candidates)))
+        results = {}
+
+        for round_idx in range(n_rounds):
+            fraction = factor ** (round_idx - n_rounds + 1)
+
+            # One stratified row sample per fold, shared by all candidates in this round
+            round_folds = []
+            for train_counts, test_counts, y_train, y_test, ngram_orders, _ in folds:
+                n_rows = max(int(len(y_train) * fraction), min_resources)
+                rows = np.arange(len(y_train))
+                # A stratified split needs at least one left-out row per class
+                if n_rows <= len(y_train) - n_classes:
+                    rows, _ = train_test_split(rows, train_size=n_rows, stratify=y_train,
+                                               random_state=int(rng.integers(2 ** 31)))
+                    rows = np.sort(rows)
+                round_folds.append((train_counts[rows], test_counts, y_train[rows], y_test, ngram_orders))
+
+            scores = Parallel(n_jobs=n_jobs)(
+                delayed(_evaluate_candidate)(*fold, candidates[i], classifier_params)
+                for i in survivors
+                for fold in round_folds
+            )
+
+            for position, i in enumerate(survivors):
+                fold_scores = pd.DataFrame(scores[position * cv:(position + 1) * cv]).mean()
+                results[i] = {
+                    **candidates[i],
+                    'rounds': round_idx + 1,
+                    'n_train_rows': len(round_folds[0][2]),
+                    **fold_scores.to_dict()
+                }
+
+            survivors = sorted(survivors, key=lambda i: results[i]['test_accuracy'], reverse=True)
+            survivors = survivors[:max(math.ceil(len(survivors) / factor), 1)]
+
+        table = pd.DataFrame(results.values())
+        table['gap'] = table['train_accuracy'] - table['test_accuracy']
+        table = table.sort_values(['rounds', 'test_accuracy'], ascending=False).reset_index(drop=True)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+
+        return table[['rank', 'C', 'max_features', 'ngram_range', 'rounds', 'n_train_rows',
+                      'test_accuracy', 'train_accuracy', 'gap', 'fit_time', 'predict_latency_ms']]
+
     def _interpret_cv_scores(self, cv_scores) -> str:
         """Interpret cross-validation scores"""
         mean = cv_scores.mean()
@@ -243,12 +1075,70 @@ class SentimentModel:
             'interpretation': balance_note
         }
 
-    def get_feature_importance(self, top_n: int = 20, sentiment: str = 'positive'):
-        """Get most important features for a sentiment"""
+    def _get_feature_names(self) -> np.ndarray:
+        """Vocabulary terms by column, computed once per fitted model"""
         if self.model is None or self.vectorizer is None:
             raise ValueError("Model not trained. Call train() first.")
 
-        feature_names = self.vectorizer.get_feature_names_out()
+        if not hasattr(self.vectorizer, 'get_feature_names_out'):
+            raise ValueError("Feature names are not available for hashed features")
+
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        return self._feature_names
+
+    def _get_coef_order(self) -> np.ndarray:
+        """Columns sorted by descending coefficient, one row per coefficient row"""
+        if self._coef_order is None:
+            self._coef_order = np.argsort(self.model.coef_, axis=1)[:, ::-1]
+        return self._coef_order
+
+    def _class_contributions(self, contributions: np.ndarray) -> dict:
+        """Map per-coefficient-row contributions to class labels"""
+        classes = list(self.model.classes_)
+
+        # Binary models have one row scoring the second class against the first
+        if contributions.shape[1] == 1:
+            return {classes[1]: contributions[:, 0], classes[0]: -contributions[:, 0]}
+
+        return {label: contributions[:, i] for i, label in enumerate(classes)}
+
+    @timed()
+    def explain(self, text: str, top_k: int = 10) -> dict:
+        """
+        Explain a prediction by each n-gram's contribution to every class
+
+        A contribution is the n-gram's TF-IDF weight in the review times the
+        class coefficient, so the contributions of a class plus its
+        intercept add up to the class decision score. Only the nonzero
+        columns of the review's row are looked at.
+
+        Args:
+            text: Cleaned review text
+            top_k: Number of n-grams to keep per class, by absolute contribution
+
+        Returns:
+            dict with the prediction, probabilities, confidence and, per class,
+            a list of (n-gram, contribution) pairs from most to least positive
+        """
+        feature_names = self._get_feature_names()
+        result = self.predict(text)
+
+        row = self.vectorizer.transform([text])
+        columns = row.indices
+        contributions = row.data[:, np.newaxis] * self.model.coef_[:, columns].T
+
+        explanation = {}
+        for label, values in self._class_contributions(contributions).items():
+            top = np.argsort(-np.abs(values), kind='stable')[:top_k]
+            top = top[np.argsort(-values[top], kind='stable')]
+            explanation[label] = [(feature_names[columns[i]], float(values[i])) for i in top]
+
+        return {**result, 'contributions': explanation}
+
+    def get_feature_importance(self, top_n: int = 20, sentiment: str = 'positive'):
+        """Get most important features for a sentiment"""
+        feature_names = self._get_feature_names()
 
         # Get class index
         sentiment_idx = list(self.model.classes_).index(sentiment)
@@ -257,7 +1147,7 @@ class SentimentModel:
         coefficients = self.model.coef_[sentiment_idx]
 
         # Get top features
-        top_indices = np.argsort(coefficients)[-top_n:][::-1]
+        top_indices = self._get_coef_order()[sentiment_idx][:top_n]
 
         return {
             feature_names[i]: float(coefficients[i])
@@ -1,22 +1,70 @@
 """
 preprocessing.py - Module for text preprocessing
 """
+import hashlib
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 import pandas as pd
+from .cache import LRUCache
+from .instrumentation import registry, timed
+
+# Bump whenever clean_text output changes, to invalidate cached results
+PREPROCESSING_VERSION = 1
+
+# Contractions word_tokenize splits even when a text has only letters and spaces
+TOKENIZER_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na')
+}
+
+# Rows per task when preprocessing in a process pool
+DEFAULT_CHUNKSIZE = 10000
+
+# Preprocessor owned by each pool worker, built once by _init_worker
+_worker_preprocessor = None
+
+
+def _init_worker(lemma_cache_size: int):
+    """Process pool initializer: load NLTK resources once per worker"""
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(lemma_cache_size=lemma_cache_size)
+
+
+def clean_chunk(texts: list) -> list:
+    """Process pool task: clean one chunk of texts in a worker of TextPreprocessor.create_pool()"""
+    return _worker_preprocessor.clean_texts(texts)
+
+
+def clean_chunk_with_lemmas(texts: list) -> tuple:
+    """Process pool task: like clean_chunk, also returning the lemmas of the chunk's distinct tokens"""
+    return _worker_preprocessor._clean_batch(texts)
 
 
 class TextPreprocessor:
     """Handle all text preprocessing operations"""
 
-    def __init__(self):
+    def __init__(self, lemma_cache_size: int = 50000, lemma_cache_path: str = None):
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
         self._download_nltk_data()
 
+        # token -> cleaned tokens (empty for stopwords), shared across calls
+        self.lemma_cache = LRUCache(maxsize=lemma_cache_size)
+        self.lemma_cache_path = Path(lemma_cache_path) if lemma_cache_path else None
+        if self.lemma_cache_path is not None:
+            self.load_lemma_cache()
+
     @staticmethod
     def _download_nltk_data():
         """Download required NLTK data"""
@@ -33,6 +81,16 @@ class TextPreprocessor:
             except LookupError:
                 nltk.download(package, quiet=True)
 
+    def get_settings(self) -> dict:
+        """Get the settings that determine preprocessing output"""
+        stop_words = " ".join(sorted(self.stop_words))
+        return {
+            'version': PREPROCESSING_VERSION,
+            'nltk_version': nltk.__version__,
+            'stop_words': hashlib.sha256(stop_words.encode()).hexdigest()
+        }
+
+    @timed()
     def clean_text(self, text: str) -> str:
         """Clean and preprocess a single text"""
         # Convert to lowercase
@@ -50,17 +108,178 @@ class TextPreprocessor:
 
         # Remove stopwords and lemmatize
         cleaned_tokens = [
-            self.lemmatizer.lemmatize(token)
+            lemma
             for token in tokens
-            if token not in self.stop_words
+            for lemma in self._clean_token(token)
         ]
 
         return " ".join(cleaned_tokens)
 
-    def preprocess_dataframe(self, df: pd.DataFrame, text_column: str = 'text') -> pd.DataFrame:
-        """Preprocess all texts in a DataFrame"""
+    def _clean_token(self, token: str) -> tuple:
+        """Stopword-filter and lemmatize one token, memoized in the lemma cache"""
+        lemmas = self.lemma_cache.get(token)
+        if lemmas is None:
+            lemmas = tuple(
+                self.lemmatizer.lemmatize(part)
+                for part in TOKENIZER_SPLITS.get(token, (token,))
+                if part not in self.stop_words
+            )
+            self.lemma_cache.put(token, lemmas)
+        return lemmas
+
+    @timed()
+    def clean_texts(self, texts) -> list:
+        """
+        Clean and preprocess a batch of texts
+
+        Gives the same output as clean_text on each text. Lowercasing and
+        character removal run as vectorized string operations, and since only
+        letters and whitespace remain, tokens come from a whitespace split
+        (plus the few contractions word_tokenize would split) instead of
+        word_tokenize. Each distinct token in the batch is looked up in the
+        lemma cache once.
+        """
+        return self._clean_batch(texts)[0]
+
+    def _clean_batch(self, texts) -> tuple:
+        """
+        Clean a batch of texts as clean_texts does
+
+        Returns:
+            (cleaned texts, dict of each distinct token in the batch -> its lemmas)
+        """
+        token_lists = (
+            pd.Series(texts, dtype=object)
+            .str.lower()
+            .str.replace(r'[^a-z\s]', '', regex=True)
+            .str.split()
+        )
+
+        # Batch-local view of the lemma cache
+        lemmas = {}
+        cleaned = []
+
+        for tokens in token_lists:
+            if not isinstance(tokens, list):
+                # Missing text
+                cleaned.append("")
+                continue
+
+            cleaned_tokens = []
+            for token in tokens:
+                lemma = lemmas.get(token)
+                if lemma is None:
+                    lemma = self._clean_token(token)
+                    lemmas[token] = lemma
+                cleaned_tokens.extend(lemma)
+
+            cleaned.append(" ".join(cleaned_tokens))
+
+        return cleaned, lemmas
+
+    def get_lemma_cache_stats(self) -> dict:
+        """Get hit/miss statistics of the lemma cache"""
+        return self.lemma_cache.get_stats()
+
+    def save_lemma_cache(self, path: str = None):
+        """Persist the lemma cache as JSON so a warm cache survives restarts"""
+        path = Path(path) if path else self.lemma_cache_path
+        if path is None:
+            raise ValueError("No lemma cache path given")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so an interrupted save never leaves a partial cache
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'settings': self.get_settings(),
+                'entries': [[token, list(lemmas)] for token, lemmas in self.lemma_cache.items()]
+            }, f)
+        os.replace(tmp_path, path)
+
+    def load_lemma_cache(self, path: str = None) -> bool:
+        """
+        Warm the lemma cache from a file written by save_lemma_cache
+
+        Returns False if the file is missing, unreadable or was written with
+        different preprocessing settings.
+        """
+        path = Path(path) if path else self.lemma_cache_path
+        if path is None or not path.exists():
+            return False
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('settings') != self.get_settings():
+                return False
+            entries = [(token, tuple(lemmas)) for token, lemmas in data['entries']]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Truncated or malformed JSON (ValueError covers JSONDecodeError) is a cache miss
+            return False
+
+        for token, lemmas in entries:
+            self.lemma_cache.put(token, lemmas)
+        return True
+
+    def create_pool(self, n_jobs: int = -1) -> ProcessPoolExecutor:
+        """
+        Create a process pool for parallel preprocessing
+
+        Each worker builds its own TextPreprocessor once at startup. Pass the
+        pool to preprocess_dataframe as `executor` to reuse it across calls.
+        """
+        if n_jobs == 0:
+            raise ValueError("n_jobs must be positive, or -1 for all cores")
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+
+        return ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(self.lemma_cache.maxsize,)
+        )
+
+    @timed()
+    def preprocess_dataframe(self, df: pd.DataFrame, text_column: str = 'text', n_jobs: int = 1,
+                             chunksize: int = DEFAULT_CHUNKSIZE,
+                             executor: ProcessPoolExecutor = None) -> pd.DataFrame:
+        """
+        Preprocess all texts in a DataFrame
+
+        Args:
+            df: DataFrame with a text column
+            text_column: Name of the column to clean
+            n_jobs: Worker processes to clean with (-1 for all cores, 1 to
+                clean in this process)
+            chunksize: Rows sent to a worker per task
+            executor: Existing pool from create_pool, used instead of n_jobs
+
+        Lemmas the workers compute are merged into this preprocessor's lemma
+        cache, so save_lemma_cache() persists them in pool mode too.
+        """
         df = df.copy()
-        df['cleaned_text'] = df[text_column].apply(self.clean_text)
+        registry.increment('TextPreprocessor.rows', len(df))
+
+        if executor is None and n_jobs == 1:
+            df['cleaned_text'] = self.clean_texts(df[text_column])
+        else:
+            texts = df[text_column].tolist()
+            chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+
+            if executor is None:
+                with self.create_pool(n_jobs) as pool:
+                    results = list(pool.map(clean_chunk_with_lemmas, chunks))
+            else:
+                results = list(executor.map(clean_chunk_with_lemmas, chunks))
+
+            for _, lemmas in results:
+                for token, lemma in lemmas.items():
+                    self.lemma_cache.put(token, lemma)
+
+            # map() returns chunks in submission order, so rows stay aligned
+            df['cleaned_text'] = [text for chunk, _ in results for text in chunk]
 
         # Calculate additional features
         df['word_count'] = df[text_column].str.split().str.len()
@@ -72,6 +291,7 @@ class TextPreprocessor:
         """Get tokens from cleaned text"""
         return word_tokenize(text)
 
+    @timed()
     def get_word_frequency(self, texts: list, top_n: int = 20) -> dict:
         """Get most frequent words from a list of texts"""
         all_text = " ".join(texts)
@@ -1,12 +1,26 @@
 """
 visualization.py - Visualization utilities (UPDATED FOR PASTEL THEME - ALL FIXED)
 """
+import io
 import plotly.graph_objects as go
 import plotly.express as px
-from wordcloud import WordCloud
+import wordcloud
+from wordcloud import WordCloud, STOPWORDS
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import numpy as np
+import pandas as pd
+from .instrumentation import timed
+
+# Above this many reviews the word-length boxplot is sent as precomputed statistics
+BOXPLOT_AGGREGATE_THRESHOLD = 50_000
+
+# Most distinct outlier values drawn per box in aggregated mode
+BOXPLOT_MAX_OUTLIERS = 200
+
+# Bump whenever _build_wordcloud or create_wordcloud_png output changes, to invalidate cached images
+WORDCLOUD_RENDER_VERSION = 1
 
 
 class Visualizer:
@@ -26,6 +40,7 @@ class Visualizer:
         self.grid_color = '#ffe8f0'
         self.title_color = '#6d3d5f'
 
+    @timed()
     def create_sentiment_pie_chart(self, sentiment_counts):
         """Create pastel-themed pie chart"""
         labels = [s.title() for s in sentiment_counts.index]
@@ -67,23 +82,73 @@ class Visualizer:
 
         return fig
 
-    def create_word_length_boxplot(self, df):
-        """Create pastel-themed boxplot"""
+    @timed()
+    def create_word_length_boxplot(self, data, aggregate: bool = None):
+        """
+        Create pastel-themed boxplot
+
+        Args:
+            data: Word-count array per sentiment (AnalyticsSnapshot.word_counts),
+                or reviews with sentiment and word_count columns
+            aggregate: Send quartiles, whiskers, mean/sd and a capped set of
+                outliers instead of every review's word count, so the figure
+                stays the same size whatever the number of reviews. Defaults
+                to True above BOXPLOT_AGGREGATE_THRESHOLD reviews.
+        """
+        if isinstance(data, pd.DataFrame):
+            data = {
+                sentiment: group['word_count'].to_numpy()
+                for sentiment, group in data.groupby('sentiment', sort=False)
+            }
+
+        if aggregate is None:
+            aggregate = sum(len(values) for values in data.values()) > BOXPLOT_AGGREGATE_THRESHOLD
+
         fig = go.Figure()
 
         for sentiment in ['positive', 'negative', 'neutral']:
-            data = df[df['sentiment'] == sentiment]['word_count']
-            if len(data) > 0:
+            values = data.get(sentiment)
+            if values is None or len(values) == 0:
+                continue
+
+            marker = dict(
+                color=self.colors[sentiment],
+                line=dict(color=self.colors[sentiment], width=2)
+            )
+
+            if not aggregate:
                 fig.add_trace(go.Box(
-                    y=data,
+                    y=values,
                     name=sentiment.title(),
-                    marker=dict(
-                        color=self.colors[sentiment],
-                        line=dict(color=self.colors[sentiment], width=2)
-                    ),
+                    marker=marker,
                     boxmean='sd',
                     hovertemplate='<b>%{y} words</b><extra></extra>'
                 ))
+                continue
+
+            stats = self.box_statistics(values)
+            fig.add_trace(go.Box(
+                x=[sentiment.title()],
+                q1=[stats['q1']],
+                median=[stats['median']],
+                q3=[stats['q3']],
+                lowerfence=[stats['lowerfence']],
+                upperfence=[stats['upperfence']],
+                mean=[stats['mean']],
+                sd=[stats['sd']],
+                name=sentiment.title(),
+                marker=marker,
+                boxmean='sd'
+            ))
+            fig.add_trace(go.Scatter(
+                x=[sentiment.title()] * len(stats['outliers']),
+                y=stats['outliers'],
+                customdata=stats['outlier_counts'],
+                mode='markers',
+                name=sentiment.title(),
+                marker=dict(color=self.colors[sentiment], size=6, opacity=0.7),
+                hovertemplate='<b>%{y} words</b><br>%{customdata:,} reviews<extra></extra>'
+            ))
 
         fig.update_layout(
             yaxis=dict(
@@ -108,6 +173,52 @@ class Visualizer:
 
         return fig
 
+    @staticmethod
+    def box_statistics(values, max_outliers: int = BOXPLOT_MAX_OUTLIERS) -> dict:
+        """
+        Box statistics of one group, computed the way Plotly computes them from raw values
+
+        Quartiles use Plotly's default linear interpolation (numpy's 'hazen'),
+        whiskers end at the most extreme values within 1.5 IQR of the box and
+        sd is the population standard deviation. Outliers are returned as
+        distinct values with their counts; when there are more than
+        max_outliers of them, an evenly spaced subset that keeps the most
+        extreme ones is returned.
+
+        Returns:
+            dict with q1, median, q3, lowerfence, upperfence, mean, sd, count,
+            n_outliers, outliers and outlier_counts
+        """
+        values = np.asarray(values, dtype=np.float64)
+        q1, median, q3 = np.percentile(values, [25, 50, 75], method='hazen')
+        iqr = q3 - q1
+
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        lowerfence = min(q1, inside.min()) if inside.size else q1
+        upperfence = max(q3, inside.max()) if inside.size else q3
+
+        outliers, counts = np.unique(values[(values < lowerfence) | (values > upperfence)],
+                                     return_counts=True)
+        n_outliers = int(counts.sum())
+        if len(outliers) > max_outliers:
+            keep = np.unique(np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int))
+            outliers, counts = outliers[keep], counts[keep]
+
+        return {
+            'q1': float(q1),
+            'median': float(median),
+            'q3': float(q3),
+            'lowerfence': float(lowerfence),
+            'upperfence': float(upperfence),
+            'mean': float(values.mean()),
+            'sd': float(values.std()),
+            'count': len(values),
+            'n_outliers': n_outliers,
+            'outliers': outliers,
+            'outlier_counts': counts
+        }
+
+    @timed()
     def create_confusion_matrix(self, cm, labels):
         """Create pastel-themed confusion matrix using matplotlib"""
         fig, ax = plt.subplots(figsize=(8, 6))
@@ -143,6 +254,20 @@ class Visualizer:
         plt.tight_layout()
         return fig
 
+    @staticmethod
+    def figure_to_png(fig, dpi=150):
+        """
+        Render a matplotlib figure to PNG bytes and close it
+
+        Keep the result narrower than Streamlit's maximum content width
+        (1460px), or st.image resizes and re-encodes it on every rerun.
+        """
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+        return buffer.getvalue()
+
+    @timed()
     def create_performance_bar_chart(self, report):
         """Create pastel-themed performance bar chart"""
         sentiments = []
@@ -239,6 +364,24 @@ class Visualizer:
 
         return fig
 
+    def _build_wordcloud(self, colormap, width, height, random_state=None):
+        """Pastel-themed WordCloud with the dashboard's layout settings"""
+        return WordCloud(
+            width=width,
+            height=height,
+            background_color='white',
+            colormap=colormap,  # Pastel colormaps: RdPu, PuRd, YlGnBu, RdYlGn
+            max_words=100,
+            relative_scaling=0.5,
+            min_font_size=10,
+            prefer_horizontal=0.7,
+            font_path=None,
+            contour_width=2,
+            contour_color='white',
+            random_state=random_state
+        )
+
+    @timed()
     def create_wordcloud(self, text, colormap='RdPu', width=1200, height=600):
         """Create pastel-themed word cloud"""
         if not text or not text.strip():
@@ -250,19 +393,7 @@ class Visualizer:
             fig.patch.set_facecolor('white')
             return fig
 
-        wordcloud = WordCloud(
-            width=width,
-            height=height,
-            background_color='white',
-            colormap=colormap,  # Pastel colormaps: RdPu, PuRd, YlGnBu, RdYlGn
-            max_words=100,
-            relative_scaling=0.5,
-            min_font_size=10,
-            prefer_horizontal=0.7,
-            font_path=None,
-            contour_width=2,
-            contour_color='white'
-        ).generate(text)
+        wordcloud = self._build_wordcloud(colormap, width, height).generate(text)
 
         fig, ax = plt.subplots(figsize=(12, 6))
         ax.imshow(wordcloud, interpolation='bilinear')
@@ -275,6 +406,44 @@ class Visualizer:
         plt.tight_layout(pad=0)
         return fig
 
+    @staticmethod
+    def wordcloud_frequencies(token_counts):
+        """Word-cloud frequencies from token counts, without WordCloud's own stopwords"""
+        return {
+            word: count
+            for word, count in token_counts.items()
+            if word.lower() not in STOPWORDS
+        }
+
+    def wordcloud_render_version(self) -> str:
+        """Identifies the word-cloud renderer, for keying cached images"""
+        return f"{WORDCLOUD_RENDER_VERSION}-wordcloud{wordcloud.__version__}-{self.text_color}"
+
+    @timed()
+    def create_wordcloud_png(self, frequencies, colormap='RdPu', width=1200, height=600):
+        """
+        Render a pastel-themed word cloud from word frequencies as PNG bytes
+
+        Uses no pyplot state, so it is safe to call from a background thread.
+        The layout is seeded, so the same frequencies always give the same image.
+        """
+        buffer = io.BytesIO()
+
+        if not frequencies:
+            fig = Figure(figsize=(width / 100, height / 100), facecolor='white')
+            ax = fig.add_subplot()
+            ax.text(0.5, 0.5, 'No data available',
+                    ha='center', va='center', fontsize=20, color=self.text_color)
+            ax.axis('off')
+            fig.savefig(buffer, format='png')
+            return buffer.getvalue()
+
+        wordcloud = self._build_wordcloud(colormap, width, height, random_state=42)
+        wordcloud.generate_from_frequencies(frequencies)
+        wordcloud.to_image().save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @timed()
     def create_top_words_bar_chart(self, word_freq_dict):
         """Create pastel-themed horizontal bar chart"""
         words = list(word_freq_dict.keys())
@@ -323,6 +492,48 @@ class Visualizer:
 
         return fig
 
+    @timed()
+    def create_contribution_chart(self, contributions, sentiment):
+        """Create pastel-themed chart of the n-grams pushing a review towards or away from a sentiment"""
+        ngrams = [ngram for ngram, _ in contributions]
+        values = [value for _, value in contributions]
+        colors_list = [self.colors.get(sentiment, '#cccccc') if v >= 0 else '#cccccc' for v in values]
+
+        fig = go.Figure(go.Bar(
+            x=values,
+            y=ngrams,
+            orientation='h',
+            marker=dict(
+                color=colors_list,
+                line=dict(color='white', width=2)
+            ),
+            hovertemplate='<b>%{y}</b><br>Contribution: %{x:.3f}<extra></extra>'
+        ))
+
+        fig.update_layout(
+            xaxis=dict(
+                title=dict(
+                    text=f'Contribution to {sentiment.title()}',
+                    font=dict(size=13, color=self.text_color, family='Poppins, sans-serif')
+                ),
+                tickfont=dict(size=11, color=self.text_color, family='Poppins, sans-serif'),
+                gridcolor=self.grid_color,
+                gridwidth=1,
+                zerolinecolor=self.text_color
+            ),
+            yaxis=dict(
+                tickfont=dict(size=12, color=self.text_color, family='Poppins, sans-serif'),
+                autorange='reversed'
+            ),
+            paper_bgcolor=self.bg_color,
+            plot_bgcolor=self.bg_color,
+            height=max(250, 40 * len(ngrams) + 100),
+            margin=dict(t=20, b=60, l=120, r=40)
+        )
+
+        return fig
+
+    @timed()
     def create_probability_chart(self, probabilities):
         """Create pastel-themed probability bar chart"""
         sentiments = list(probabilities.keys())
@@ -0,0 +1,82 @@
+"""
+Tests for src/browser.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.browser import ReviewBrowser
+
+WORDS = ['dress', 'fit', 'Fabric', 'love', 'small', 'zip', 'colour', 'return']
+LABELS = ['negative', 'neutral', 'positive']
+
+
+def make_reviews(n_rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Random reviews from a small vocabulary, so keywords match often"""
+    texts = [' '.join(rng.choice(WORDS, size=rng.integers(1, 12))) for _ in range(n_rows)]
+    df = pd.DataFrame({'text': texts, 'sentiment': rng.choice(LABELS, size=n_rows)})
+    df['word_count'] = df['text'].str.split().str.len()
+    return df
+
+
+def expected_rows(df: pd.DataFrame, sentiment: str, keyword: str, min_words, max_words) -> pd.DataFrame:
+    """The rows a filter should return, in order, using boolean masks"""
+    rows = df if sentiment == 'all' else df[df['sentiment'] == sentiment]
+    if min_words is not None or max_words is not None:
+        lo = -np.inf if min_words is None else min_words
+        hi = np.inf if max_words is None else max_words
+        rows = rows[rows['word_count'].between(lo, hi)].sort_values('word_count', kind='stable')
+    if keyword:
+        rows = rows[rows['text'].str.contains(keyword, case=False, regex=False)]
+    return rows
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_page_matches_boolean_masks(seed):
+    rng = np.random.default_rng(seed)
+    df = make_reviews(int(rng.integers(0, 400)), rng)
+    browser = ReviewBrowser(df, scan_block=int(rng.integers(1, 64)), cursor_cache_size=4)
+
+    for _ in range(20):
+        sentiment = rng.choice(LABELS + ['all', 'unknown'])
+        keyword = rng.choice(['', 'fit', 'FABRIC', 'zip dress', 'nomatch', str(rng.choice(WORDS))])
+        min_words = rng.choice([None, int(rng.integers(0, 8))])
+        max_words = rng.choice([None, int(rng.integers(0, 12))])
+        page_size = int(rng.integers(1, 30))
+
+        expected = expected_rows(df, sentiment, keyword, min_words, max_words)
+        n_pages = len(expected) // page_size + 2
+
+        # Random page order exercises resuming keyword scans from remembered cursors
+        for page in rng.permutation(n_pages):
+            result = browser.page(page=int(page), page_size=page_size, sentiment=sentiment,
+                                  keyword=keyword, min_words=min_words, max_words=max_words)
+            start = page * page_size
+
+            assert result['rows'].index.tolist() == expected.index[start:start + page_size].tolist()
+            assert result['has_next'] == (start + page_size < len(expected))
+            assert result['total'] in (None, len(expected))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_sample_walks_each_sentiment_without_repeats(seed):
+    rng = np.random.default_rng(seed)
+    df = make_reviews(int(rng.integers(1, 300)), rng)
+    browser = ReviewBrowser(df, random_state=seed)
+
+    for sentiment in LABELS + ['all']:
+        expected = df if sentiment == 'all' else df[df['sentiment'] == sentiment]
+        n = int(rng.integers(1, 20))
+
+        seen = []
+        for draw in range(-(-len(expected) // n)):
+            rows = browser.sample(n=n, sentiment=sentiment, draw=draw)
+            assert len(rows) == min(n, len(expected))
+            assert rows.index.is_unique
+            assert rows.index.isin(expected.index).all()
+            seen.extend(rows.index)
+
+        # Draws only wrap around once every review has been shown
+        assert set(seen) == set(expected.index)
+        if len(expected) % n == 0:
+            assert len(seen) == len(set(seen))
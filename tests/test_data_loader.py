@@ -0,0 +1,67 @@
+"""
+Tests for src/data_loader.py
+"""
+import numpy as np
+import pytest
+
+from src.data_loader import DataLoader
+
+# Whole records plus fragments that produce separators inside lines,
+# partial markers, blank entries and indented fields
+FRAGMENTS = [
+    'SENTIMENT: positive\n', 'REVIEW: love the colour\n', '---\n', '\n---\n  ',
+    'SENTIMENT: ', 'SENTIMENT:', 'REVIEW: ', 'REVIEW:', 'Positive', 'negative ', 'great fit',
+    'too small', '---', '--', '-', '\n', '\n', '\n', '\r\n', ' ', '\t', 'SENTIMENT', '  REVIEW: x'
+]
+
+
+def split_parser(content: str) -> list:
+    """The original load_from_txt parser, splitting the whole file on '---'"""
+    records = []
+    for entry in content.split('---'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        sentiment = None
+        review = None
+        for line in entry.split('\n'):
+            if line.startswith('SENTIMENT:'):
+                sentiment = line.replace('SENTIMENT:', '').strip().lower()
+            elif line.startswith('REVIEW:'):
+                review = line.replace('REVIEW:', '').strip()
+        if sentiment and review:
+            records.append((sentiment, review))
+    return records
+
+
+def random_txt(rng: np.random.Generator) -> str:
+    return ''.join(rng.choice(FRAGMENTS, size=rng.integers(0, 60)))
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_parse_txt_lines_matches_split_parser(seed, tmp_path):
+    content = random_txt(np.random.default_rng(seed))
+    path = tmp_path / 'reviews.txt'
+    path.write_bytes(content.encode('utf-8'))
+
+    # The original read the file in text mode, which turns '\r\n' into '\n'
+    expected = split_parser(content.replace('\r\n', '\n'))
+    loader = DataLoader()
+
+    assert list(loader.iter_txt_records(str(path))) == expected
+    assert list(loader.iter_txt_records(str(path), use_mmap=True)) == expected
+
+
+def test_load_from_txt_reads_sample_format(tmp_path):
+    path = tmp_path / 'reviews.txt'
+    path.write_text(
+        "SENTIMENT: Positive\nREVIEW: Love this dress\n---\n"
+        "SENTIMENT: negative\nREVIEW: Seams came apart --- twice\n---\n"
+        "REVIEW: no label\n---\n",
+        encoding='utf-8'
+    )
+
+    df = DataLoader().load_from_txt(str(path))
+
+    assert df['sentiment'].tolist() == ['positive', 'negative']
+    assert df['text'].tolist() == ['Love this dress', 'Seams came apart']
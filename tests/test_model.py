@@ -0,0 +1,116 @@
+"""
+Tests for src/model.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference import load_compact
+from src.model import SentimentModel, MIN_ROWS_PER_CLASS
+from config.config import REVIEWS_CSV
+
+POSITIVE = ['great dress love the fit', 'amazing fabric perfect size', 'love the color great quality']
+NEGATIVE = ['bad quality seams torn', 'awful fit cheap fabric', 'terrible zipper broke quickly']
+
+
+def make_reviews(n_rows: int, random_state: int = 0):
+    """Small two-class corpus of cleaned reviews"""
+    rng = np.random.default_rng(random_state)
+    texts, labels = [], []
+    for i in range(n_rows):
+        phrases = POSITIVE if i % 2 else NEGATIVE
+        texts.append(' '.join(rng.choice(phrases, size=2)))
+        labels.append('positive' if i % 2 else 'negative')
+    return texts, labels
+
+
+@pytest.fixture(scope='module')
+def sample_model():
+    """Model trained on the sample reviews (lowercased text, no NLTK preprocessing needed)"""
+    df = pd.read_csv(REVIEWS_CSV)
+    texts = df['text'].str.lower()
+    model = SentimentModel()
+    model.train(texts, df['sentiment'])
+    return model, texts.tolist()
+
+
+def test_compiled_predictor_matches_predict_proba(sample_model):
+    model, texts = sample_model
+    predictor = model.compile()
+
+    expected = model.model.predict_proba(model.vectorizer.transform(texts))
+    actual = np.array([predictor.predict_proba(text) for text in texts])
+
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+    assert list(predictor.classes) == list(model.model.classes_)
+
+
+def test_export_compact_round_trip(sample_model, tmp_path):
+    model, texts = sample_model
+    path = tmp_path / 'compact.npz'
+
+    model.export_compact(str(path), threshold=0, coef_dtype='float64')
+    predictor = load_compact(str(path))
+
+    expected = model.model.predict_proba(model.vectorizer.transform(texts))
+    actual = np.array([predictor.predict_proba(text) for text in texts])
+
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-6)
+    assert [p.name for p in tmp_path.iterdir()] == ['compact.npz']
+
+
+def test_tune_hyperparameters_small_two_class_dataset():
+    X, y = make_reviews(120)
+
+    table = SentimentModel().tune_hyperparameters(X, y, cv=3, n_jobs=1)
+
+    assert len(table) == 27
+    assert table['rank'].tolist() == list(range(1, 28))
+    assert table['test_accuracy'].between(0, 1).all()
+
+    # 27 candidates would take four rounds, but with 80 training rows per fold
+    # the first would sample 2 and the second 8, below the floor of 2 * 5 rows
+    assert table['rounds'].max() == 2
+    assert table['n_train_rows'].min() >= 2 * MIN_ROWS_PER_CLASS
+
+
+def test_tune_hyperparameters_runs_every_round_on_enough_data():
+    X, y = make_reviews(600)
+
+    table = SentimentModel().tune_hyperparameters(X, y, cv=3, n_jobs=1)
+
+    # 400 training rows per fold: the first of four rounds samples 14
+    assert table['rounds'].max() == 4
+    assert table['n_train_rows'].min() >= 2 * MIN_ROWS_PER_CLASS
+
+
+@pytest.mark.parametrize('factor', [0, 1])
+def test_tune_hyperparameters_rejects_factor_below_two(factor):
+    X, y = make_reviews(60)
+
+    with pytest.raises(ValueError):
+        SentimentModel().tune_hyperparameters(X, y, factor=factor, n_jobs=1)
+
+
+def test_train_streaming_scores_every_held_out_row():
+    X, y = make_reviews(300)
+    df = pd.DataFrame({'cleaned_text': X, 'sentiment': y})
+    chunks = [df.iloc[i:i + 100] for i in range(0, len(df), 100)]
+
+    model = SentimentModel(test_size=0.2)
+    metrics = model.train_streaming(chunks)
+
+    # The same draws train_streaming uses to pick each chunk's held-out rows
+    rng = np.random.default_rng(model.random_state)
+    held_out = sum(int((rng.random(len(chunk)) < 0.2).sum()) for chunk in chunks)
+    assert len(metrics['y_test']) == held_out
+
+
+def test_train_streaming_single_chunk_has_held_out_metrics():
+    X, y = make_reviews(100)
+    df = pd.DataFrame({'cleaned_text': X, 'sentiment': y})
+
+    metrics = SentimentModel(test_size=0.2).train_streaming([df])
+
+    assert len(metrics['y_test']) > 0
+    assert 0 <= metrics['accuracy'] <= 1
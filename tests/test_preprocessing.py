@@ -0,0 +1,77 @@
+"""
+Tests for src/preprocessing.py
+"""
+import numpy as np
+import pytest
+
+from src.data_loader import DataLoader
+from src.preprocessing import TextPreprocessor
+from config.config import REVIEWS_CSV
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "\t\n",
+    "!!! ... ???",
+    "123 456 7.89",
+    "I don't think it's worth it, can't recommend",
+    "Won't fit, wouldn't buy; gonna return it",
+    "Café naïve résumé",
+    "ALL CAPS REVIEW",
+    "dress\tfits\nwell",
+    "the and a of",
+    "Dresses, shoes & bags!!!",
+]
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    return TextPreprocessor()
+
+
+def assert_same_as_clean_text(preprocessor: TextPreprocessor, texts: list):
+    expected = [preprocessor.clean_text(text) for text in texts]
+    assert preprocessor.clean_texts(texts) == expected
+
+
+def test_clean_texts_matches_clean_text_on_reviews(preprocessor):
+    texts = DataLoader(str(REVIEWS_CSV)).load_from_csv()['text'].tolist()
+    assert_same_as_clean_text(preprocessor, texts)
+
+
+def test_clean_texts_matches_clean_text_on_edge_cases(preprocessor):
+    assert_same_as_clean_text(preprocessor, EDGE_CASES)
+
+
+def test_clean_texts_matches_clean_text_with_a_cold_cache():
+    assert_same_as_clean_text(TextPreprocessor(), EDGE_CASES[::-1])
+
+
+def test_clean_texts_empty_batch(preprocessor):
+    assert preprocessor.clean_texts([]) == []
+
+
+def test_clean_texts_non_str_input_is_empty(preprocessor):
+    texts = [None, np.nan, 42, "Great dress", 3.5]
+
+    cleaned = preprocessor.clean_texts(texts)
+
+    assert cleaned == ["", "", "", preprocessor.clean_text("Great dress"), ""]
+
+
+def test_preprocess_dataframe_pool_merges_worker_lemmas():
+    df = DataLoader(str(REVIEWS_CSV)).load_from_csv()
+    serial = TextPreprocessor().preprocess_dataframe(df, n_jobs=1)
+
+    pooled_preprocessor = TextPreprocessor()
+    pooled = pooled_preprocessor.preprocess_dataframe(df, n_jobs=2, chunksize=7)
+
+    assert pooled['cleaned_text'].tolist() == serial['cleaned_text'].tolist()
+    tokens = {token for text in df['text'].str.lower().str.replace(r'[^a-z\s]', '', regex=True)
+              for token in text.split()}
+    assert set(dict(pooled_preprocessor.lemma_cache.items())) == tokens
+
+
+def test_create_pool_rejects_zero_workers(preprocessor):
+    with pytest.raises(ValueError):
+        preprocessor.create_pool(n_jobs=0)
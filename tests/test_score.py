@@ -0,0 +1,109 @@
+"""
+Tests for score.py checkpoints and resuming
+"""
+import argparse
+import json
+
+import pandas as pd
+import pytest
+
+import score
+from src.model import SentimentModel
+from config.config import REVIEWS_CSV
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory):
+    df = pd.read_csv(REVIEWS_CSV)
+    model = SentimentModel()
+    model.train(df['text'].str.lower(), df['sentiment'])
+    path = tmp_path_factory.mktemp('model') / 'model.joblib'
+    model.save(str(path))
+    return path
+
+
+def make_args(input_path, output_path, model_path, **kwargs) -> argparse.Namespace:
+    settings = {
+        'input': str(input_path), 'output': str(output_path), 'model': str(model_path),
+        'format': 'csv', 'chunksize': 50, 'jobs': 1, 'engine': None, 'errors': 'drop',
+        'no_text': False, 'restart': False
+    }
+    settings.update(kwargs)
+    return argparse.Namespace(**settings)
+
+
+def interrupt_after(monkeypatch, n_chunks: int):
+    """Make score_file fail while scoring chunk `n_chunks` (zero-based)"""
+    calls = []
+    score_chunk = score.score_chunk
+
+    def failing_score_chunk(*args, **kwargs):
+        if len(calls) == n_chunks:
+            raise RuntimeError("interrupted")
+        calls.append(1)
+        return score_chunk(*args, **kwargs)
+
+    monkeypatch.setattr(score, 'score_chunk', failing_score_chunk)
+
+
+def test_csv_output_truncates_to_checkpoint(tmp_path):
+    path = tmp_path / 'scores.csv'
+    first = pd.DataFrame({'row': [0, 1], 'prediction': ['positive', 'negative']})
+    second = pd.DataFrame({'row': [2, 3], 'prediction': ['neutral', 'positive']})
+
+    checkpoint = score.Checkpoint(tmp_path / 'scores.csv.checkpoint.json', run={})
+    output = score.CSVOutput(path)
+    output.open(checkpoint)
+    checkpoint.output_bytes = output.write(first, 0)
+    checkpoint.completed_chunks = 1
+    output.write(second, 1)
+    output.close()
+
+    # A crash part way through the next chunk leaves a partial row behind
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('4,neu')
+
+    output.open(checkpoint)
+    output.write(second, 1)
+    output.close()
+
+    assert pd.read_csv(path).equals(pd.concat([first, second], ignore_index=True))
+
+
+def test_resume_after_interruption_matches_uninterrupted_run(tmp_path, model_path, monkeypatch):
+    expected_path = tmp_path / 'expected.csv'
+    score.score_file(make_args(REVIEWS_CSV, expected_path, model_path))
+
+    output_path = tmp_path / 'scores.csv'
+    args = make_args(REVIEWS_CSV, output_path, model_path)
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 3)
+        with pytest.raises(RuntimeError):
+            score.score_file(args)
+
+    checkpoint_path = output_path.with_name(output_path.name + '.checkpoint.json')
+    state = json.loads(checkpoint_path.read_text())
+    assert state['completed_chunks'] == 3
+    assert state['output_bytes'] == output_path.stat().st_size
+
+    with open(output_path, 'a', encoding='utf-8') as f:
+        f.write('150,"half a row')
+
+    score.score_file(args)
+
+    assert output_path.read_bytes() == expected_path.read_bytes()
+    assert not checkpoint_path.exists()
+
+
+def test_resume_rejects_changed_settings(tmp_path, model_path, monkeypatch):
+    output_path = tmp_path / 'scores.csv'
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 1)
+        with pytest.raises(RuntimeError):
+            score.score_file(make_args(REVIEWS_CSV, output_path, model_path))
+
+    with pytest.raises(ValueError):
+        score.score_file(make_args(REVIEWS_CSV, output_path, model_path, chunksize=80))
+
+    score.score_file(make_args(REVIEWS_CSV, output_path, model_path, chunksize=80, restart=True))
+    assert len(pd.read_csv(output_path)) == len(pd.read_csv(REVIEWS_CSV))